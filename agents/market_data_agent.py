@@ -3,6 +3,7 @@ import ccxt
 import json
 import time
 import psycopg2
+from psycopg2.extras import execute_values
 from datetime import datetime
 import redis
 import sys
@@ -41,15 +42,17 @@ class MarketDataAgent:
                 # Fetch OHLCV data
                 ohlcv = self.exchange.fetch_ohlcv(symbol, '5m', limit=10)
                 
-                # Store in database
+                # Store in database, all candles in one multi-row INSERT
                 cursor = self.db_conn.cursor()
-                for candle in ohlcv:
-                    timestamp = datetime.fromtimestamp(candle[0]/1000)
-                    cursor.execute("""
-                        INSERT INTO market_data (symbol, timestamp, open, high, low, close, volume, exchange)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT DO NOTHING
-                    """, (symbol, timestamp, candle[1], candle[2], candle[3], candle[4], candle[5], 'kraken'))
+                rows = [
+                    (symbol, datetime.fromtimestamp(candle[0]/1000), candle[1], candle[2], candle[3], candle[4], candle[5], 'kraken')
+                    for candle in ohlcv
+                ]
+                execute_values(cursor, """
+                    INSERT INTO market_data (symbol, timestamp, open, high, low, close, volume, exchange)
+                    VALUES %s
+                    ON CONFLICT DO NOTHING
+                """, rows)
                 
                 self.db_conn.commit()
                 cursor.close()
@@ -0,0 +1,50 @@
+// Clientside rendering of the professional dashboard portfolio chart.
+// The server only ships the {x, y} series; the static trace styling and
+// layout live here so they are not rebuilt and re-serialized every tick.
+
+var PORTFOLIO_TRACE = {
+    type: 'scatter',
+    mode: 'lines',
+    fill: 'tozeroy',
+    line: {color: '#00ff88', width: 2},
+    fillcolor: 'rgba(0, 255, 136, 0.1)',
+    name: 'Portfolio Value'
+};
+
+var PORTFOLIO_LAYOUT = {
+    plot_bgcolor: 'rgba(0,0,0,0)',
+    paper_bgcolor: 'rgba(0,0,0,0)',
+    font: {color: '#e0e0e0', family: 'JetBrains Mono, monospace'},
+    xaxis: {
+        showgrid: true,
+        gridcolor: 'rgba(45, 55, 72, 0.5)',
+        color: '#888',
+        showline: false
+    },
+    yaxis: {
+        showgrid: true,
+        gridcolor: 'rgba(45, 55, 72, 0.5)',
+        color: '#888',
+        showline: false
+    },
+    margin: {l: 40, r: 20, t: 20, b: 40},
+    hovermode: 'x unified',
+    hoverlabel: {
+        bgcolor: '#1a1f3a',
+        font: {size: 12, family: 'JetBrains Mono, monospace'}
+    }
+};
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    portfolio: {
+        render: function(series) {
+            if (!series) {
+                return window.dash_clientside.no_update;
+            }
+            return {
+                data: [Object.assign({x: series.x, y: series.y}, PORTFOLIO_TRACE)],
+                layout: PORTFOLIO_LAYOUT
+            };
+        }
+    }
+});
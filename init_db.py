@@ -80,6 +80,7 @@ def init_database():
             user="trader",
             password="trader_password_2024"
         )
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)  # CREATE INDEX CONCURRENTLY can't run in a transaction
         cursor = conn.cursor()
     else:
         # On Railway, already connected to the database
@@ -162,18 +163,119 @@ def init_database():
         )
     """)
     
+    # Running cumulative P&L, appended per trade so the dashboard chart reads it with an index seek
     cursor.execute("""
-        CREATE INDEX idx_trades_timestamp ON trades(timestamp)
+        CREATE TABLE IF NOT EXISTS portfolio_pnl (
+            id BIGSERIAL PRIMARY KEY,
+            timestamp TIMESTAMP NOT NULL,
+            cumulative_pnl DECIMAL(20, 8) NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE OR REPLACE FUNCTION record_portfolio_pnl() RETURNS trigger AS $$
+        BEGIN
+            -- Serialize appends so concurrent trades don't read the same running total
+            PERFORM pg_advisory_xact_lock(hashtext('portfolio_pnl'));
+            INSERT INTO portfolio_pnl (timestamp, cumulative_pnl)
+            SELECT COALESCE(NEW.timestamp, NOW()),
+                   COALESCE((SELECT cumulative_pnl FROM portfolio_pnl ORDER BY timestamp DESC, id DESC LIMIT 1), 0)
+                   + COALESCE(NEW.pnl, 0);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # Only where trades records P&L; a trigger reading a missing column would fail every trade insert
+    cursor.execute("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'trades' AND column_name = 'pnl'
+    """)
+    if cursor.fetchone() is not None:
+        cursor.execute("DROP TRIGGER IF EXISTS trades_portfolio_pnl ON trades")
+        cursor.execute("""
+            CREATE TRIGGER trades_portfolio_pnl
+            AFTER INSERT ON trades
+            FOR EACH ROW EXECUTE FUNCTION record_portfolio_pnl()
+        """)
+        # Backfill from existing trades the first time round
+        cursor.execute("""
+            INSERT INTO portfolio_pnl (timestamp, cumulative_pnl)
+            SELECT timestamp, SUM(COALESCE(pnl, 0)) OVER (ORDER BY timestamp, id)
+            FROM trades
+            WHERE timestamp IS NOT NULL AND NOT EXISTS (SELECT 1 FROM portfolio_pnl)
+        """)
+    
+    # Push new agent rows to dashboard listeners (payloads over NOTIFY's 8000-byte limit carry only the id).
+    # The timestamp is sent in one fixed format, since row_to_json trims trailing zeros from the fraction
+    cursor.execute("""
+        CREATE OR REPLACE FUNCTION notify_agent_row() RETURNS trigger AS $$
+        DECLARE
+            payload TEXT := (to_jsonb(NEW) || jsonb_build_object(
+                'timestamp', to_char(NEW.timestamp, 'YYYY-MM-DD"T"HH24:MI:SS.US')
+            ))::text;
+        BEGIN
+            IF octet_length(payload) > 7900 THEN
+                payload := json_build_object('id', NEW.id)::text;
+            END IF;
+            PERFORM pg_notify(TG_TABLE_NAME, payload);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in ('agent_decisions', 'agent_logs'):
+        cursor.execute("SELECT to_regclass(%s)", (table,))
+        if cursor.fetchone()[0] is None:
+            continue
+        cursor.execute(f"DROP TRIGGER IF EXISTS {table}_notify ON {table}")
+        cursor.execute(f"""
+            CREATE TRIGGER {table}_notify
+            AFTER INSERT ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_agent_row()
+        """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_positions_symbol ON positions(symbol)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_market_data_symbol ON market_data(symbol, timestamp)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_portfolio_pnl_timestamp ON portfolio_pnl(timestamp DESC)
+    """)
+    
+    # Dashboard feeds read the newest rows first; built concurrently so running agents aren't blocked
+    cursor.execute("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_agent_decisions_timestamp ON agent_decisions(timestamp DESC)
     """)
+    # Latest-snapshot reads (Telegram /status and /pnl) and the open-positions filter
     cursor.execute("""
-        CREATE INDEX idx_trades_symbol ON trades(symbol)
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_risk_metrics_timestamp ON risk_metrics(timestamp DESC)
     """)
     cursor.execute("""
-        CREATE INDEX idx_positions_symbol ON positions(symbol)
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_positions_open ON positions(symbol)
+        WHERE status = 'open'
     """)
+    # The orchestrator's recent-trades count filters on executed_at, where trades has that column
     cursor.execute("""
-        CREATE INDEX idx_market_data_symbol ON market_data(symbol, timestamp)
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'trades' AND column_name = 'executed_at'
     """)
+    if cursor.fetchone() is not None:
+        cursor.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trades_executed_at ON trades(executed_at DESC)
+        """)
+    cursor.execute("SELECT to_regclass('agent_logs')")
+    if cursor.fetchone()[0] is not None:
+        # Partial index matching the dashboard's log_level filter
+        cursor.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_agent_logs_timestamp ON agent_logs(timestamp DESC)
+            WHERE log_level IN ('INFO', 'WARNING', 'ERROR')
+        """)
     
     conn.commit()
     cursor.close()
@@ -6,8 +6,10 @@ Provides database query functions that the LLM can call to access trading data
 """
 
 import json
+import threading
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import pandas as pd
@@ -17,11 +19,29 @@ class TradingDataTools:
     
     def __init__(self, db_config: Dict[str, Any]):
         self.db_config = db_config
+        self._local = threading.local()
     
     def get_connection(self):
-        """Get database connection"""
+        """Get database connection (the shared one inside a shared_connection block)"""
+        shared = getattr(self._local, 'conn', None)
+        if shared is not None:
+            return shared
         return psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
     
+    def release_connection(self, conn):
+        """Close a connection from get_connection unless it is the shared one"""
+        if conn is not getattr(self._local, 'conn', None):
+            conn.close()
+    
+    @contextmanager
+    def shared_connection(self, conn):
+        """Run every tool call in this thread on the given connection"""
+        self._local.conn = conn
+        try:
+            yield self
+        finally:
+            self._local.conn = None
+    
     def query_trades(
         self, 
         symbol: Optional[str] = None,
@@ -78,7 +98,7 @@ class TradingDataTools:
             cursor.execute(query, params)
             trades = cursor.fetchall()
             cursor.close()
-            conn.close()
+            self.release_connection(conn)
             
             # Convert datetime objects to strings for JSON serialization
             for trade in trades:
@@ -135,7 +155,7 @@ class TradingDataTools:
             cursor.execute(query, params)
             decisions = cursor.fetchall()
             cursor.close()
-            conn.close()
+            self.release_connection(conn)
             
             # Convert datetime objects to strings
             for decision in decisions:
@@ -187,7 +207,7 @@ class TradingDataTools:
             positions = cursor.fetchone()
             
             cursor.close()
-            conn.close()
+            self.release_connection(conn)
             
             result = {
                 "latest_metrics": dict(latest_metrics) if latest_metrics else {},
@@ -233,7 +253,7 @@ class TradingDataTools:
             
             market_data = cursor.fetchall()
             cursor.close()
-            conn.close()
+            self.release_connection(conn)
             
             # Convert datetime objects to strings
             for candle in market_data:
@@ -274,7 +294,7 @@ class TradingDataTools:
             max_drawdowns = [float(m['max_drawdown']) for m in metrics if m.get('max_drawdown')]
             
             cursor.close()
-            conn.close()
+            self.release_connection(conn)
             
             return {
                 "period_days": days,
@@ -336,7 +356,7 @@ class TradingDataTools:
             trade_stats = {row['agent']: dict(row) for row in cursor.fetchall()}
             
             cursor.close()
-            conn.close()
+            self.release_connection(conn)
             
             # Combine stats
             results = []
@@ -395,7 +415,7 @@ class TradingDataTools:
             agent_activity = cursor.fetchall()
             
             cursor.close()
-            conn.close()
+            self.release_connection(conn)
             
             # Convert datetime objects
             for decision in pending_decisions:
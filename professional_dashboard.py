@@ -5,22 +5,36 @@ Bloomberg Terminal-inspired design with deep agent insights and GPT-4o integrati
 """
 
 import dash
-from dash import dcc, html, Input, Output, State, ctx, ALL
+from dash import dcc, html, Input, Output, State, ctx, ALL, ClientsideFunction, DiskcacheManager, no_update
+from dash.exceptions import PreventUpdate
 import dash_auth
-import plotly.graph_objs as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import ccxt
 import json
 import time
 from datetime import datetime, timedelta
 import threading
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import requests
+import diskcache
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+from contextlib import contextmanager
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 from llm_tools import TradingDataTools, FUNCTION_DEFINITIONS, execute_function
 
+# Dash serializes callback responses through plotly.io.json; orjson is several times faster
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
 # AUTHENTICATION
 VALID_USERNAME_PASSWORD_PAIRS = {
     'admin': 'CryptoTrader2024!'
@@ -33,9 +47,73 @@ with open('/opt/crypto-trading/config.json', 'r') as f:
 # Initialize trading data tools
 trading_tools = TradingDataTools(config['database'])
 
-# Database connection
+# Snapshot queries, prepared once per pooled connection and then run with EXECUTE
+SNAPSHOT_QUERIES = {
+    'portfolio_latest': """
+        SELECT total_value, cash_balance, positions, pnl, pnl_percentage
+        FROM portfolio
+        ORDER BY timestamp DESC
+        LIMIT $1
+    """,
+    # Latest points, already in chronological order
+    'risk_history': """
+        SELECT timestamp, total_capital
+        FROM (
+            SELECT timestamp, total_capital
+            FROM risk_metrics
+            ORDER BY timestamp DESC
+            LIMIT $1
+        ) recent
+        ORDER BY timestamp ASC
+    """
+}
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """Connection that remembers which SNAPSHOT_QUERIES it has already prepared"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+def execute_prepared(cursor, name, *params):
+    """Run a SNAPSHOT_QUERIES statement, preparing it on first use by this connection"""
+    conn = cursor.connection
+    if name not in conn.prepared:
+        cursor.execute(f"PREPARE {name} AS {SNAPSHOT_QUERIES[name]}")
+        conn.prepared.add(name)
+    cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+
+# Database connection pool (created on first use so the app still starts without a DB)
+db_pool = None
+db_pool_lock = threading.Lock()
+
+def get_db_pool():
+    global db_pool
+    with db_pool_lock:
+        if db_pool is None:
+            db_pool = ThreadedConnectionPool(
+                5, 25,
+                **config['database'],
+                connection_factory=PreparingConnection,
+                cursor_factory=RealDictCursor,
+                keepalives=1,
+                keepalives_idle=30,
+                options='-c idle_in_transaction_session_timeout=20000'
+            )
+        return db_pool
+
+@contextmanager
 def get_db_connection():
-    return psycopg2.connect(**config['database'], cursor_factory=RealDictCursor)
+    """Borrow a pooled connection and hand it back afterwards"""
+    pool = get_db_pool()
+    conn = pool.getconn()
+    if conn.closed:
+        pool.putconn(conn, close=True)
+        conn = pool.getconn()
+    try:
+        conn.autocommit = True  # read-only queries; a failure must not abort later ones
+        yield conn
+    finally:
+        pool.putconn(conn, close=bool(conn.closed))
 
 # Initialize exchanges
 exchanges = {}
@@ -66,12 +144,28 @@ if config.get('kraken_api_key') and config.get('kraken_api_secret'):
 # Cache and state
 cache = {}
 cache_lock = threading.Lock()
+cache_key_locks = {}
 chat_history = []
-chat_lock = threading.Lock()
+
+# The chat callback runs as a background job in its own process, so its state lives on disk:
+# the job queue and progress for Dash, plus recent replies keyed on (normalized prompt,
+# history digest). Replies are short-lived because answers about live portfolio data go stale
+CHAT_CACHE_DIR = './.chat-cache'
+CHAT_CACHE_TTL = 300
+CHAT_CACHE_SIZE_LIMIT = 64 * 2**20
+# Minimum seconds between partial-reply pushes to the browser while streaming
+CHAT_PROGRESS_INTERVAL = 0.25
+background_manager = DiskcacheManager(diskcache.Cache(f'{CHAT_CACHE_DIR}/jobs'))
+chat_reply_cache = diskcache.Cache(f'{CHAT_CACHE_DIR}/replies', size_limit=CHAT_CACHE_SIZE_LIMIT)
+
+# Worker threads for the external API calls in update_metrics
+executor = ThreadPoolExecutor(max_workers=4)
 
 def get_cached_or_fetch(key, fetch_func, ttl=30):
-    """Get cached data or fetch new"""
+    """Get cached data or fetch new (one fetch per key at a time, keys in parallel)"""
     with cache_lock:
+        key_lock = cache_key_locks.setdefault(key, threading.Lock())
+    with key_lock:
         now = time.time()
         if key in cache:
             data, timestamp, error = cache[key]
@@ -97,6 +191,22 @@ def fetch_balance(exchange_name):
         raise Exception(f"{exchange_name} not configured")
     return exchanges[exchange_name].fetch_balance().get('total', {})
 
+def build_price_map(prices):
+    """USD price per balance code, covering stablecoins and Kraken's legacy asset codes"""
+    return {
+        'USD': 1.0, 'ZUSD': 1.0, 'USDT': 1.0,
+        'BTC': prices['BTC'], 'XBT': prices['BTC'],
+        'ETH': prices['ETH'], 'XETH': prices['ETH'],
+        'SOL': prices['SOL']
+    }
+
+def balance_usd(balance, price_map):
+    """Total USD value of an exchange balance in one pass over the priced assets"""
+    return float(np.fromiter(
+        ((balance.get(asset) or 0.0) * price for asset, price in price_map.items()),
+        dtype=np.float64, count=len(price_map)
+    ).sum())
+
 def get_crypto_prices():
     """Fetch current crypto prices"""
     try:
@@ -113,8 +223,151 @@ def get_crypto_prices():
     except:
         return {'BTC': 111220, 'ETH': 3971, 'SOL': 190}
 
-def chat_with_gpt4o(user_message, conversation_history):
-    """Chat with GPT-4o using function calling"""
+# Per-resource TTLs: slow-moving aggregates are refreshed far less often than the 5s tick
+TOOL_CACHE_TTLS = {
+    'get_orchestrator_state': 15,
+    'get_agent_decisions': 30,
+    'get_portfolio_metrics': 60,
+    'get_risk_analysis': 60,
+    'get_agent_performance': 120
+}
+
+def cached_tool_call(name, **kwargs):
+    """Call a trading_tools method, memoized for its TTL in TOOL_CACHE_TTLS"""
+    key = f"tool:{name}:{sorted(kwargs.items())}"
+    result, _ = get_cached_or_fetch(key, lambda: getattr(trading_tools, name)(**kwargs), ttl=TOOL_CACHE_TTLS[name])
+    
+    # Tool methods report failures in-band; retry next tick instead of caching them
+    sample = result[0] if isinstance(result, list) and result else result
+    if isinstance(sample, dict) and 'error' in sample:
+        cache.pop(key, None)
+    return result
+
+# Horizontal resolution of the portfolio chart; M4 keeps at most 4 points per pixel column
+CHART_PIXEL_WIDTH = 400
+
+def m4_downsample(timestamps, values, width=CHART_PIXEL_WIDTH):
+    """M4 downsampling: keep the first, last, min and max point of each pixel column"""
+    if len(values) <= 4 * width:
+        return timestamps, values
+    
+    t = pd.to_datetime(timestamps, utc=True).asi8
+    # Divide before multiplying: nanoseconds times width overflows int64 past ~266 days
+    columns = (t - t[0]) // ((t[-1] - t[0]) // width + 1)
+    grouped = pd.Series(values, dtype='float64').groupby(columns)
+    keep = np.unique(np.concatenate([
+        grouped.head(1).index, grouped.tail(1).index,
+        grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()
+    ]))
+    return [timestamps[i] for i in keep], [values[i] for i in keep]
+
+def mock_portfolio_series(initial_capital, points=100):
+    """Placeholder hourly series for when there is no risk_metrics history yet"""
+    now = datetime.now()
+    timestamps = [now - timedelta(hours=i) for i in range(points, 0, -1)]
+    drift = np.random.uniform(-0.05, 0.15, size=points) * (np.arange(points) / points)
+    return timestamps, (initial_capital * (1 + drift)).tolist()
+
+def fetch_snapshot():
+    """Fetch everything the interval callbacks render on a single connection"""
+    snapshot = {'portfolio': None, 'history': []}
+    with get_db_connection() as conn:
+        with trading_tools.shared_connection(conn):
+            # Plain tuple rows: these are read positionally, so skip the per-row dicts
+            cursor = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+            try:
+                execute_prepared(cursor, 'portfolio_latest', 1)
+                snapshot['portfolio'] = cursor.fetchone()
+            except Exception as e:
+                print(f"Error fetching portfolio from database: {e}")
+            
+            try:
+                execute_prepared(cursor, 'risk_history', 100)
+                snapshot['history'] = cursor.fetchall()
+            except Exception as e:
+                print(f"Error fetching portfolio history: {e}")
+            cursor.close()
+            
+            snapshot['portfolio_metrics'] = cached_tool_call('get_portfolio_metrics')
+            snapshot['agent_decisions'] = cached_tool_call('get_agent_decisions', limit=15, hours_back=24)
+            snapshot['orchestrator_state'] = cached_tool_call('get_orchestrator_state')
+            snapshot['trades'] = trading_tools.query_trades(limit=20)
+            snapshot['agent_performance'] = cached_tool_call('get_agent_performance', days=7)
+            snapshot['risk_analysis'] = cached_tool_call('get_risk_analysis', days=7)
+    return snapshot
+
+def get_dashboard_snapshot():
+    """Shared per-tick snapshot; expires just before the next 5s interval"""
+    snapshot, error = get_cached_or_fetch('dashboard_snapshot', fetch_snapshot, ttl=4)
+    if not snapshot:
+        # Connection failed: mirror the error shapes the tool calls return
+        tool_error = {'error': error}
+        snapshot = {
+            'portfolio': None,
+            'history': [],
+            'portfolio_metrics': tool_error,
+            'agent_decisions': [tool_error],
+            'orchestrator_state': tool_error,
+            'trades': [tool_error],
+            'agent_performance': [tool_error],
+            'risk_analysis': tool_error
+        }
+    return snapshot
+
+def stream_chat_completion(headers, payload, on_delta):
+    """POST a streaming chat completion, forwarding content deltas to on_delta.
+    
+    Returns the assembled assistant message, including any tool calls.
+    """
+    response = requests.post(
+        'https://api.openai.com/v1/chat/completions',
+        headers=headers,
+        json={**payload, 'stream': True},
+        timeout=60,
+        stream=True
+    )
+    
+    if response.status_code != 200:
+        raise Exception(f"{response.status_code} - {response.text}")
+    
+    content = []
+    tool_calls = {}
+    for line in response.iter_lines():
+        if not line.startswith(b'data: '):
+            continue
+        data = line[len(b'data: '):]
+        if data == b'[DONE]':
+            break
+        
+        choices = json.loads(data).get('choices')
+        if not choices:
+            continue
+        delta = choices[0].get('delta', {})
+        
+        if delta.get('content'):
+            content.append(delta['content'])
+            on_delta(delta['content'])
+        
+        # Tool calls arrive as fragments keyed by index
+        for call in delta.get('tool_calls') or []:
+            entry = tool_calls.setdefault(call['index'], {
+                'id': '',
+                'type': 'function',
+                'function': {'name': '', 'arguments': ''}
+            })
+            if call.get('id'):
+                entry['id'] = call['id']
+            function = call.get('function', {})
+            entry['function']['name'] += function.get('name') or ''
+            entry['function']['arguments'] += function.get('arguments') or ''
+    
+    message = {'role': 'assistant', 'content': ''.join(content) or None}
+    if tool_calls:
+        message['tool_calls'] = [tool_calls[i] for i in sorted(tool_calls)]
+    return message
+
+def chat_with_gpt4o(user_message, conversation_history, on_delta=lambda text: None):
+    """Chat with GPT-4o using function calling, streaming the reply to on_delta"""
     try:
         headers = {
             'Authorization': f"Bearer {config.get('openai_api_key')}",
@@ -146,18 +399,7 @@ Provide insightful analysis based on the actual data. Be professional, concise,
             'temperature': 0.7
         }
         
-        response = requests.post(
-            'https://api.openai.com/v1/chat/completions',
-            headers=headers,
-            json=payload,
-            timeout=60
-        )
-        
-        if response.status_code != 200:
-            return f"Error: {response.status_code} - {response.text}"
-        
-        response_data = response.json()
-        assistant_message = response_data['choices'][0]['message']
+        assistant_message = stream_chat_completion(headers, payload, on_delta)
         
         # Handle function calls
         if assistant_message.get('tool_calls'):
@@ -165,7 +407,7 @@ Provide insightful analysis based on the actual data. Be professional, concise,
             function_results = []
             for tool_call in assistant_message['tool_calls']:
                 function_name = tool_call['function']['name']
-                function_args = json.loads(tool_call['function']['arguments'])
+                function_args = json.loads(tool_call['function']['arguments'] or '{}')
                 
                 # Execute the function
                 result = execute_function(function_name, function_args, trading_tools)
@@ -183,22 +425,11 @@ Provide insightful analysis based on the actual data. Be professional, concise,
             payload['messages'] = messages
             payload.pop('tool_choice', None)  # Remove tool_choice for second call
             
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers=headers,
-                json=payload,
-                timeout=60
-            )
-            
-            if response.status_code != 200:
-                return f"Error in function call response: {response.status_code}"
-            
-            response_data = response.json()
-            final_message = response_data['choices'][0]['message']['content']
-            return final_message
+            final_message = stream_chat_completion(headers, payload, on_delta)
+            return final_message['content'] or 'No response generated'
         else:
             # No function calls, return direct response
-            return assistant_message.get('content', 'No response generated')
+            return assistant_message['content'] or 'No response generated'
             
     except Exception as e:
         return f"Error communicating with GPT-4o: {str(e)}"
@@ -284,11 +515,13 @@ app.index_string = '''
                 border-radius: 50%;
                 background: #00ff88;
                 animation: pulse-dot 2s ease-in-out infinite;
+                will-change: transform, opacity;
+                transform: translateZ(0);
             }
             
             @keyframes pulse-dot {
-                0%, 100% { opacity: 1; transform: scale(1); }
-                50% { opacity: 0.6; transform: scale(1.2); }
+                0%, 100% { opacity: 1; transform: scale(1) translateZ(0); }
+                50% { opacity: 0.6; transform: scale(1.2) translateZ(0); }
             }
             
             /* Grid System */
@@ -310,6 +543,7 @@ app.index_string = '''
                 box-shadow: 0 4px 15px rgba(0, 0, 0, 0.3);
                 position: relative;
                 overflow: hidden;
+                contain: layout paint;
             }
             
             .terminal-panel::before {
@@ -583,6 +817,11 @@ app.index_string = '''
                 letter-spacing: 0.5px;
             }
             
+            .chat-send-btn:disabled {
+                opacity: 0.5;
+                cursor: wait;
+            }
+            
             .chat-send-btn:hover {
                 transform: translateY(-2px);
                 box-shadow: 0 4px 15px rgba(0, 255, 136, 0.3);
@@ -738,10 +977,12 @@ app.index_string = '''
                 border-radius: 50%;
                 border-top-color: #00ff88;
                 animation: spin 1s linear infinite;
+                will-change: transform;
+                transform: translateZ(0);
             }
             
             @keyframes spin {
-                to { transform: rotate(360deg); }
+                to { transform: rotate(360deg) translateZ(0); }
             }
         </style>
     </head>
@@ -756,6 +997,92 @@ app.index_string = '''
 </html>
 '''
 
+# Exchange balances scaffold: built once, update_metrics fills in the values by id
+STATUS_OK_STYLE = {'float': 'right', 'color': '#00ff88', 'fontSize': '11px', 'fontFamily': 'JetBrains Mono, monospace'}
+STATUS_ERROR_STYLE = {**STATUS_OK_STYLE, 'color': '#ff5252'}
+
+def exchange_card(exchange, name, color, card_style):
+    """Static card for one exchange with placeholders for status, USD value and asset count"""
+    return html.Div([
+        html.Div([
+            html.Span(name, style={'fontWeight': '600', 'fontSize': '13px'}),
+            html.Span(id=f'{exchange}-status', style=STATUS_OK_STYLE)
+        ]),
+        html.Div(id=f'{exchange}-usd', style={
+            'fontSize': '24px',
+            'fontWeight': '700',
+            'color': color,
+            'marginTop': '8px',
+            'fontFamily': 'JetBrains Mono, monospace'
+        }),
+        html.Div(id=f'{exchange}-assets', style={
+            'color': '#666',
+            'fontSize': '11px',
+            'marginTop': '5px',
+            'fontFamily': 'JetBrains Mono, monospace'
+        })
+    ], style=card_style)
+
+def price_row(symbol, last=False):
+    """Static market price row with a placeholder for the price"""
+    return html.Div([
+        html.Span(symbol, style={'color': '#888', 'fontSize': '11px'}),
+        html.Span(id=f'price-{symbol.lower()}', style={'float': 'right', 'color': '#fff', 'fontSize': '11px', 'fontFamily': 'JetBrains Mono, monospace'})
+    ], style={} if last else {'marginBottom': '8px'})
+
+EXCHANGE_PANEL = html.Div([
+    exchange_card('binance', "BINANCE", '#00d4ff', {
+        'background': 'rgba(0, 212, 255, 0.05)',
+        'padding': '15px',
+        'borderRadius': '6px',
+        'marginBottom': '15px',
+        'border': '1px solid rgba(0, 212, 255, 0.2)'
+    }),
+    exchange_card('kraken', "KRAKEN", '#9c27b0', {
+        'background': 'rgba(156, 39, 176, 0.05)',
+        'padding': '15px',
+        'borderRadius': '6px',
+        'border': '1px solid rgba(156, 39, 176, 0.2)'
+    }),
+    
+    html.Hr(style={'borderColor': '#2d3748', 'margin': '20px 0'}),
+    
+    # Market prices
+    html.Div([
+        price_row("BTC"),
+        price_row("ETH"),
+        price_row("SOL", last=True)
+    ])
+], id='exchange-balances')
+
+def format_timestamps(timestamps, fmt, fallback):
+    """Format a column of timestamps in one vectorized pass; unparseable values are sliced by fallback"""
+    formatted = pd.to_datetime(
+        pd.Series(timestamps, dtype=object), errors='coerce', utc=True, format='ISO8601'
+    ).dt.strftime(fmt)
+    return [text if isinstance(text, str) else str(raw)[fallback] for text, raw in zip(formatted, timestamps)]
+
+def render_chat(messages):
+    """Render the chat transcript, or the welcome message when it is empty"""
+    if not messages:
+        return html.Div([
+            html.Div([
+                html.Div("AI ASSISTANT", className='chat-message-header'),
+                html.Div("👋 Hello! I'm your AI trading assistant powered by GPT-4o with full database access. I can analyze trades, explain agent decisions, provide market insights, and answer questions about your portfolio. What would you like to know?", 
+                        className='chat-message-content')
+            ], className='chat-message assistant')
+        ])
+    
+    chat_display = []
+    for msg in messages:
+        is_user = msg['role'] == 'user'
+        chat_msg = html.Div([
+            html.Div("YOU" if is_user else "AI ASSISTANT", className='chat-message-header'),
+            html.Div(msg['content'], className='chat-message-content')
+        ], className=f'chat-message {"" if is_user else "assistant"}')
+        chat_display.append(chat_msg)
+    return html.Div(chat_display)
+
 # Layout
 app.layout = html.Div([
     
@@ -821,7 +1148,7 @@ app.layout = html.Div([
         html.Div([
             html.Div([
                 html.Div("EXCHANGE BALANCES", className='panel-header'),
-                html.Div(id='exchange-balances')
+                EXCHANGE_PANEL
             ], className='terminal-panel')
         ], className='col-4'),
         
@@ -855,7 +1182,10 @@ app.layout = html.Div([
                     html.Span("FUNCTION CALLING ENABLED", className='panel-badge')
                 ], className='panel-header'),
                 html.Div([
-                    html.Div(id='chat-history', className='chat-messages'),
+                    html.Div([
+                        html.Div(render_chat([]), id='chat-history'),
+                        html.Div(id='chat-pending')
+                    ], className='chat-messages'),
                     html.Div([
                         dcc.Input(
                             id='chat-input',
@@ -895,18 +1225,67 @@ app.layout = html.Div([
         
     ], className='terminal-grid'),
     
-    # Update interval
-    dcc.Interval(id='interval-update', interval=5000, n_intervals=0),
+    # Update intervals, one per refresh cadence
+    dcc.Interval(id='interval-fast', interval=5000, n_intervals=0),  # 5 seconds: prices, metrics, trades
+    dcc.Interval(id='interval-mid', interval=30000, n_intervals=0),  # 30 seconds: agents, orchestrator
+    dcc.Interval(id='interval-slow', interval=120000, n_intervals=0),  # 2 minutes: 7-day performance & risk
     
     # Store for chat history
     dcc.Store(id='chat-store', data=[]),
     
+    # Portfolio chart series, rendered client-side
+    dcc.Store(id='portfolio-series'),
+    
+    # Digest of the values update_metrics last sent to this tab
+    dcc.Store(id='metrics-digest'),
+    
 ])
 
+# Shared callback styles: built once instead of re-allocated for every card on every tick
+MONO_FONT = 'JetBrains Mono, monospace'
+STYLE_EMPTY = {'color': '#666', 'textAlign': 'center', 'padding': '40px'}
+STYLE_LABEL_11 = {'color': '#888', 'fontSize': '11px'}
+STYLE_VALUE_MONO_11 = {'color': '#fff', 'fontSize': '11px', 'fontFamily': MONO_FONT}
+STYLE_CONF_MONO_11 = {**STYLE_VALUE_MONO_11, 'color': '#00d4ff'}
+STYLE_PNL_UP_MONO_11 = {**STYLE_VALUE_MONO_11, 'color': '#00ff88'}
+STYLE_PNL_DOWN_MONO_11 = {**STYLE_VALUE_MONO_11, 'color': '#ff5252'}
+STYLE_MARGIN_TOP_5 = {'marginTop': '5px'}
+STYLE_MARGIN_TOP_8 = {'marginTop': '8px'}
+STYLE_MARGIN_BOTTOM_20 = {'marginBottom': '20px'}
+STYLE_SEPARATOR = {'color': '#444'}
+STYLE_FLOW_TITLE = {'fontWeight': '600', 'fontSize': '12px', 'marginBottom': '5px'}
+STYLE_CARD = {
+    'background': 'rgba(0, 0, 0, 0.3)',
+    'padding': '15px',
+    'borderRadius': '6px',
+    'marginBottom': '12px',
+    'border': '1px solid #2d3748'
+}
+STYLE_ACTIVITY_CARD = {**STYLE_CARD, 'padding': '12px', 'marginBottom': '10px'}
+STYLE_ACTIVITY_NAME = {'fontWeight': '600', 'color': '#00ff88'}
+STYLE_ACTIVITY_COUNT = {'float': 'right', **STYLE_LABEL_11}
+STYLE_ACTIVITY_CONF = {'fontSize': '11px', 'color': '#00d4ff'}
+STYLE_PERF_NAME = {'fontWeight': '600', 'fontSize': '13px'}
+STYLE_FLOAT_RIGHT = {'float': 'right'}
+STYLE_PENDING_CARD = {
+    'background': 'rgba(255, 152, 0, 0.05)',
+    'padding': '10px',
+    'borderRadius': '4px',
+    'marginBottom': '8px',
+    'borderLeft': '2px solid #ff9800'
+}
+STYLE_RISK_VALUE = {'fontSize': '18px', 'fontWeight': '600', 'fontFamily': MONO_FONT}
+STYLE_RISK_UP = {**STYLE_RISK_VALUE, 'color': '#00ff88'}
+STYLE_RISK_DOWN = {**STYLE_RISK_VALUE, 'color': '#ff5252'}
+STYLE_RISK_INFO = {**STYLE_RISK_VALUE, 'color': '#00d4ff'}
+STYLE_RISK_WARN = {**STYLE_RISK_VALUE, 'color': '#ff9800'}
+STYLE_RISK_HEADLINE_UP = {**STYLE_RISK_UP, 'fontSize': '20px', 'fontWeight': '700'}
+STYLE_RISK_HEADLINE_DOWN = {**STYLE_RISK_HEADLINE_UP, 'color': '#ff5252'}
+
 # Callbacks
 @app.callback(
     Output('current-time', 'children'),
-    Input('interval-update', 'n_intervals')
+    Input('interval-fast', 'n_intervals')
 )
 def update_time(n):
     """Update current time"""
@@ -921,33 +1300,42 @@ def update_time(n):
      Output('position-exposure', 'children'),
      Output('win-rate', 'children'),
      Output('sharpe-ratio', 'children'),
-     Output('exchange-balances', 'children'),
-     Output('portfolio-chart', 'figure')],
-    Input('interval-update', 'n_intervals')
+     Output('binance-status', 'children'),
+     Output('binance-status', 'style'),
+     Output('binance-usd', 'children'),
+     Output('binance-assets', 'children'),
+     Output('kraken-status', 'children'),
+     Output('kraken-status', 'style'),
+     Output('kraken-usd', 'children'),
+     Output('kraken-assets', 'children'),
+     Output('price-btc', 'children'),
+     Output('price-eth', 'children'),
+     Output('price-sol', 'children'),
+     Output('portfolio-series', 'data'),
+     Output('metrics-digest', 'data')],
+    Input('interval-fast', 'n_intervals'),
+    State('metrics-digest', 'data')
 )
-def update_metrics(n):
+def update_metrics(n, last_digest):
     """Update top-level metrics"""
     
-    # Get portfolio data from database
+    # Start the external API calls so they overlap with each other and the DB snapshot
+    binance_future = executor.submit(get_cached_or_fetch, 'binance', lambda: fetch_balance('binance'), ttl=30)
+    kraken_future = executor.submit(get_cached_or_fetch, 'kraken', lambda: fetch_balance('kraken'), ttl=30)
+    prices_future = executor.submit(get_crypto_prices)
+    
+    snapshot = get_dashboard_snapshot()
+    
+    # Get portfolio data from the shared snapshot
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get latest portfolio snapshot
-        cursor.execute("""
-            SELECT total_value, cash_balance, positions, pnl, pnl_percentage
-            FROM portfolio
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """)
-        portfolio_data = cursor.fetchone()
+        portfolio_data = snapshot['portfolio']
         
         if portfolio_data:
-            total_value = float(portfolio_data['total_value'])
-            cash_balance = float(portfolio_data['cash_balance'])
-            positions = portfolio_data['positions']
-            total_pnl = float(portfolio_data['pnl'])
-            pnl_pct = float(portfolio_data['pnl_percentage'])
+            total_value, cash_balance, positions, total_pnl, pnl_pct = portfolio_data
+            total_value = float(total_value)
+            cash_balance = float(cash_balance)
+            total_pnl = float(total_pnl)
+            pnl_pct = float(pnl_pct)
         else:
             # Fallback if no data
             total_value = 0
@@ -955,36 +1343,39 @@ def update_metrics(n):
             positions = {}
             total_pnl = 0
             pnl_pct = 0
-            
-        cursor.close()
-        conn.close()
     except Exception as e:
         print(f"Error fetching portfolio from database: {e}")
         total_value = 0
         total_pnl = 0
         pnl_pct = 0
     
-    # Fetch balances for display (optional, for exchange status)
-    binance_balance, binance_error = get_cached_or_fetch('binance', lambda: fetch_balance('binance'), ttl=30)
-    kraken_balance, kraken_error = get_cached_or_fetch('kraken', lambda: fetch_balance('kraken'), ttl=30)
-    
-    # Get prices for exchange balance calculation
-    prices = get_crypto_prices()
+    # Wait for the exchange balances (for exchange status) and prices
+    binance_balance, binance_error = binance_future.result()
+    kraken_balance, kraken_error = kraken_future.result()
+    prices = prices_future.result()
     
     # Calculate exchange USD values for display
-    binance_usd = binance_balance.get('USDT', 0) + binance_balance.get('USD', 0)
-    kraken_usd = kraken_balance.get('USD', 0) + kraken_balance.get('ZUSD', 0)
-    
-    # Add crypto values for display
-    binance_usd += binance_balance.get('BTC', 0) * prices['BTC']
-    kraken_usd += (kraken_balance.get('BTC', 0) + kraken_balance.get('XBT', 0)) * prices['BTC']
-    binance_usd += binance_balance.get('ETH', 0) * prices['ETH']
-    kraken_usd += (kraken_balance.get('ETH', 0) + kraken_balance.get('XETH', 0)) * prices['ETH']
+    price_map = build_price_map(prices)
+    binance_usd = balance_usd(binance_balance, price_map)
+    kraken_usd = balance_usd(kraken_balance, price_map)
     
     # Get portfolio metrics from database
-    portfolio_metrics = trading_tools.get_portfolio_metrics()
+    portfolio_metrics = snapshot['portfolio_metrics']
     latest_metrics = portfolio_metrics.get('latest_metrics', {})
     
+    # Nothing this tab shows has changed since the last tick: skip rebuilding and resending it
+    history = snapshot['history']
+    digest = hashlib.blake2b(repr((
+        total_value, total_pnl, pnl_pct,
+        sorted(latest_metrics.items()), portfolio_metrics.get('open_positions_count', 0),
+        binance_usd, str(binance_error), sorted(binance_balance.items()),
+        kraken_usd, str(kraken_error), sorted(kraken_balance.items()),
+        prices['BTC'], prices['ETH'], prices['SOL'],
+        len(history), history[-1] if history else None
+    )).encode(), digest_size=16).hexdigest()
+    if digest == last_digest:
+        raise PreventUpdate
+    
     # Portfolio value
     portfolio_value_display = f"${total_value:,.2f}"
     
@@ -1018,185 +1409,62 @@ def update_metrics(n):
     binance_status = "⚠ BLOCKED" if binance_error and "451" in str(binance_error) else ("⚠ ERROR" if binance_error else "✓ ONLINE")
     kraken_status = "⚠ ERROR" if kraken_error else "✓ ONLINE"
     
-    exchange_display = html.Div([
-        # Binance
-        html.Div([
-            html.Div([
-                html.Span("BINANCE", style={'fontWeight': '600', 'fontSize': '13px'}),
-                html.Span(binance_status, style={
-                    'float': 'right',
-                    'color': '#ff5252' if binance_error else '#00ff88',
-                    'fontSize': '11px',
-                    'fontFamily': 'JetBrains Mono, monospace'
-                })
-            ]),
-            html.Div(f"${binance_usd:,.2f}", style={
-                'fontSize': '24px',
-                'fontWeight': '700',
-                'color': '#00d4ff',
-                'marginTop': '8px',
-                'fontFamily': 'JetBrains Mono, monospace'
-            }),
-            html.Div(f"ASSETS: {len([k for k, v in binance_balance.items() if v > 0])}", style={
-                'color': '#666',
-                'fontSize': '11px',
-                'marginTop': '5px',
-                'fontFamily': 'JetBrains Mono, monospace'
-            })
-        ], style={
-            'background': 'rgba(0, 212, 255, 0.05)',
-            'padding': '15px',
-            'borderRadius': '6px',
-            'marginBottom': '15px',
-            'border': '1px solid rgba(0, 212, 255, 0.2)'
-        }),
-        
-        # Kraken
-        html.Div([
-            html.Div([
-                html.Span("KRAKEN", style={'fontWeight': '600', 'fontSize': '13px'}),
-                html.Span(kraken_status, style={
-                    'float': 'right',
-                    'color': '#ff5252' if kraken_error else '#00ff88',
-                    'fontSize': '11px',
-                    'fontFamily': 'JetBrains Mono, monospace'
-                })
-            ]),
-            html.Div(f"${kraken_usd:,.2f}", style={
-                'fontSize': '24px',
-                'fontWeight': '700',
-                'color': '#9c27b0',
-                'marginTop': '8px',
-                'fontFamily': 'JetBrains Mono, monospace'
-            }),
-            html.Div(f"ASSETS: {len([k for k, v in kraken_balance.items() if v > 0])}", style={
-                'color': '#666',
-                'fontSize': '11px',
-                'marginTop': '5px',
-                'fontFamily': 'JetBrains Mono, monospace'
-            })
-        ], style={
-            'background': 'rgba(156, 39, 176, 0.05)',
-            'padding': '15px',
-            'borderRadius': '6px',
-            'border': '1px solid rgba(156, 39, 176, 0.2)'
-        }),
-        
-        html.Hr(style={'borderColor': '#2d3748', 'margin': '20px 0'}),
-        
-        # Market prices
-        html.Div([
-            html.Div([
-                html.Span("BTC", style={'color': '#888', 'fontSize': '11px'}),
-                html.Span(f"${prices['BTC']:,.2f}", style={'float': 'right', 'color': '#fff', 'fontSize': '11px', 'fontFamily': 'JetBrains Mono, monospace'})
-            ], style={'marginBottom': '8px'}),
-            html.Div([
-                html.Span("ETH", style={'color': '#888', 'fontSize': '11px'}),
-                html.Span(f"${prices['ETH']:,.2f}", style={'float': 'right', 'color': '#fff', 'fontSize': '11px', 'fontFamily': 'JetBrains Mono, monospace'})
-            ], style={'marginBottom': '8px'}),
-            html.Div([
-                html.Span("SOL", style={'color': '#888', 'fontSize': '11px'}),
-                html.Span(f"${prices['SOL']:,.2f}", style={'float': 'right', 'color': '#fff', 'fontSize': '11px', 'fontFamily': 'JetBrains Mono, monospace'})
-            ])
-        ])
-    ])
+    binance_status_style = STATUS_ERROR_STYLE if binance_error else STATUS_OK_STYLE
+    kraken_status_style = STATUS_ERROR_STYLE if kraken_error else STATUS_OK_STYLE
+    binance_assets = f"ASSETS: {len([k for k, v in binance_balance.items() if v > 0])}"
+    kraken_assets = f"ASSETS: {len([k for k, v in kraken_balance.items() if v > 0])}"
     
     # Portfolio chart
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT timestamp, total_capital, total_pnl
-            FROM risk_metrics
-            ORDER BY timestamp DESC
-            LIMIT 100
-        """)
-        history = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        
         if history:
-            history = list(reversed(history))
-            timestamps = [h['timestamp'] for h in history]
-            values = [float(h['total_capital']) for h in history]
+            timestamps = [row[0] for row in history]
+            values = np.fromiter((row[1] for row in history), dtype=np.float64, count=len(history))
+            timestamps, values = m4_downsample(timestamps, values)
         else:
             # Generate mock data
-            timestamps = [datetime.now() - timedelta(hours=i) for i in range(100, 0, -1)]
-            values = [initial_capital * (1 + np.random.uniform(-0.05, 0.15) * (i/100)) for i in range(100)]
+            timestamps, values = mock_portfolio_series(initial_capital)
     except:
-        timestamps = [datetime.now() - timedelta(hours=i) for i in range(100, 0, -1)]
-        values = [initial_capital * (1 + np.random.uniform(-0.05, 0.15) * (i/100)) for i in range(100)]
-    
-    portfolio_fig = go.Figure()
-    portfolio_fig.add_trace(go.Scatter(
-        x=timestamps,
-        y=values,
-        mode='lines',
-        fill='tozeroy',
-        line=dict(color='#00ff88', width=2),
-        fillcolor='rgba(0, 255, 136, 0.1)',
-        name='Portfolio Value'
-    ))
-    
-    portfolio_fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#e0e0e0', family='JetBrains Mono, monospace'),
-        xaxis=dict(
-            showgrid=True,
-            gridcolor='rgba(45, 55, 72, 0.5)',
-            color='#888',
-            showline=False
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor='rgba(45, 55, 72, 0.5)',
-            color='#888',
-            showline=False
-        ),
-        margin=dict(l=40, r=20, t=20, b=40),
-        hovermode='x unified',
-        hoverlabel=dict(
-            bgcolor='#1a1f3a',
-            font_size=12,
-            font_family='JetBrains Mono, monospace'
-        )
-    )
+        timestamps, values = mock_portfolio_series(initial_capital)
+    
+    # Only the series is shipped; assets/portfolio.js builds the figure client-side
+    portfolio_series = {'x': timestamps, 'y': values}
     
     return (portfolio_value_display, portfolio_change_display, daily_pnl_display, daily_pnl_change_display,
             open_positions_display, position_exposure_display, win_rate_display, sharpe_display,
-            exchange_display, portfolio_fig)
+            binance_status, binance_status_style, f"${binance_usd:,.2f}", binance_assets,
+            kraken_status, kraken_status_style, f"${kraken_usd:,.2f}", kraken_assets,
+            f"${prices['BTC']:,.2f}", f"${prices['ETH']:,.2f}", f"${prices['SOL']:,.2f}",
+            portfolio_series, digest)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='portfolio', function_name='render'),
+    Output('portfolio-chart', 'figure'),
+    Input('portfolio-series', 'data')
+)
 
 @app.callback(
     [Output('agent-insights', 'children'),
      Output('agent-count', 'children')],
-    Input('interval-update', 'n_intervals')
+    Input('interval-mid', 'n_intervals')
 )
 def update_agent_insights(n):
     """Update agent insights with detailed reasoning"""
     
-    agent_decisions = trading_tools.get_agent_decisions(limit=15, hours_back=24)
+    agent_decisions = get_dashboard_snapshot()['agent_decisions']
     
     if not agent_decisions or 'error' in agent_decisions[0]:
         return html.Div([
-            html.Div("🔍 NO AGENT ACTIVITY", style={'textAlign': 'center', 'color': '#666', 'padding': '40px'}),
+            html.Div("🔍 NO AGENT ACTIVITY", style=STYLE_EMPTY),
             html.Div("Agents are analyzing markets and will log decisions here.", style={'textAlign': 'center', 'color': '#444', 'fontSize': '12px'})
         ], style={'marginTop': '20px'}), "0 ACTIVE"
     
+    timestamps = format_timestamps([d.get('timestamp', '') for d in agent_decisions], '%H:%M:%S', slice(-8, None))
+    
     agent_cards = []
-    for decision in agent_decisions:
+    for decision, timestamp in zip(agent_decisions, timestamps):
         agent_name = decision.get('agent', 'unknown').replace('_', ' ').upper()
         agent_class = decision.get('agent', 'unknown').split('_')[0]
         
-        timestamp = decision.get('timestamp', '')
-        if isinstance(timestamp, str):
-            try:
-                timestamp = datetime.fromisoformat(timestamp).strftime('%H:%M:%S')
-            except:
-                timestamp = str(timestamp)[-8:] if len(str(timestamp)) >= 8 else str(timestamp)
-        else:
-            timestamp = str(timestamp)
-        
         agent_card = html.Div([
             html.Div([
                 html.Span(f"🤖 {agent_name}", className='agent-name'),
@@ -1207,7 +1475,7 @@ def update_agent_insights(n):
                     className='agent-reasoning'),
             html.Div([
                 html.Span(f"CONFIDENCE: {decision.get('confidence', 0):.1f}%", className='agent-confidence'),
-                html.Span(" | ", style={'color': '#444'}),
+                html.Span(" | ", style=STYLE_SEPARATOR),
                 html.Span(
                     "EXECUTED" if decision.get('executed') else "PENDING",
                     className=f"agent-status {'executed' if decision.get('executed') else ''}"
@@ -1219,15 +1487,32 @@ def update_agent_insights(n):
     
     return html.Div(agent_cards), f"{len(agent_decisions)} DECISIONS"
 
+@lru_cache(maxsize=32)
+def render_pending_queue(top_pending):
+    """Render the pending queue from (agent, confidence, decision) tuples"""
+    return html.Div([
+        html.Div("⏳ PENDING QUEUE", style={'fontSize': '13px', 'fontWeight': '600', 'color': '#ff9800', 'marginTop': '20px', 'marginBottom': '15px'}),
+        html.Div([
+            html.Div([
+                html.Div([
+                    html.Span(agent.replace('_', ' ').upper(), style={'fontWeight': '600', 'fontSize': '11px', 'color': '#fff'}),
+                    html.Span(f"CONF: {confidence:.0f}%", style={'float': 'right', 'fontSize': '11px', 'color': '#00ff88'})
+                ]),
+                html.Div(decision, style={'fontSize': '11px', 'color': '#888', 'marginTop': '5px'})
+            ], style=STYLE_PENDING_CARD)
+            for agent, confidence, decision in top_pending
+        ]) if top_pending else html.Div("No pending decisions", style={'color': '#666', 'fontSize': '12px', 'textAlign': 'center', 'padding': '20px'})
+    ])
+
 @app.callback(
     [Output('orchestrator-viz', 'children'),
      Output('orchestrator-status', 'children')],
-    Input('interval-update', 'n_intervals')
+    Input('interval-mid', 'n_intervals')
 )
 def update_orchestrator(n):
     """Update orchestrator visualization"""
     
-    orchestrator_state = trading_tools.get_orchestrator_state()
+    orchestrator_state = get_dashboard_snapshot()['orchestrator_state']
     
     if 'error' in orchestrator_state:
         return html.Div("ERROR LOADING ORCHESTRATOR STATE", style={'color': '#ff5252', 'textAlign': 'center', 'padding': '40px'}), "ERROR"
@@ -1235,6 +1520,19 @@ def update_orchestrator(n):
     pending_decisions = orchestrator_state.get('pending_decisions', [])
     agent_activity = orchestrator_state.get('agent_activity', [])
     
+    # One pass over the queue: count unexecuted decisions and keep the top 5 for display
+    pending_count = 0
+    top_pending = []
+    for d in pending_decisions:
+        if not d.get('executed'):
+            pending_count += 1
+        if len(top_pending) < 5:
+            top_pending.append((
+                d.get('agent', 'unknown'),
+                d.get('confidence', 0),
+                d.get('decision', 'No decision')[:100]
+            ))
+    
     # Agent Activity Summary
     activity_cards = []
     for activity in agent_activity[:5]:
@@ -1244,19 +1542,13 @@ def update_orchestrator(n):
         
         activity_card = html.Div([
             html.Div([
-                html.Span(agent_name, style={'fontWeight': '600', 'color': '#00ff88'}),
-                html.Span(f"{decisions_count} DECISIONS", style={'float': 'right', 'fontSize': '11px', 'color': '#888'})
+                html.Span(agent_name, style=STYLE_ACTIVITY_NAME),
+                html.Span(f"{decisions_count} DECISIONS", style=STYLE_ACTIVITY_COUNT)
             ]),
             html.Div([
-                html.Span(f"AVG CONFIDENCE: {avg_confidence:.1f}%", style={'fontSize': '11px', 'color': '#00d4ff'})
-            ], style={'marginTop': '5px'})
-        ], style={
-            'background': 'rgba(0, 0, 0, 0.3)',
-            'padding': '12px',
-            'borderRadius': '6px',
-            'marginBottom': '10px',
-            'border': '1px solid #2d3748'
-        })
+                html.Span(f"AVG CONFIDENCE: {avg_confidence:.1f}%", style=STYLE_ACTIVITY_CONF)
+            ], style=STYLE_MARGIN_TOP_5)
+        ], style=STYLE_ACTIVITY_CARD)
         activity_cards.append(activity_card)
     
     # Decision Pipeline
@@ -1264,44 +1556,26 @@ def update_orchestrator(n):
         html.Div("🔄 DECISION PIPELINE", style={'fontSize': '13px', 'fontWeight': '600', 'color': '#00d4ff', 'marginBottom': '15px'}),
         html.Div([
             html.Div([
-                html.Div("1. AGENT ANALYSIS", style={'fontWeight': '600', 'fontSize': '12px', 'marginBottom': '5px'}),
+                html.Div("1. AGENT ANALYSIS", style=STYLE_FLOW_TITLE),
                 html.Div(f"{len(agent_activity)} agents active", style={'fontSize': '11px', 'color': '#888'})
             ], className='flow-node'),
             html.Div([
-                html.Div("2. DECISION RANKING", style={'fontWeight': '600', 'fontSize': '12px', 'marginBottom': '5px'}),
+                html.Div("2. DECISION RANKING", style=STYLE_FLOW_TITLE),
                 html.Div("By confidence & priority", style={'fontSize': '11px', 'color': '#888'})
             ], className='flow-node'),
             html.Div([
-                html.Div("3. RISK VALIDATION", style={'fontWeight': '600', 'fontSize': '12px', 'marginBottom': '5px'}),
+                html.Div("3. RISK VALIDATION", style=STYLE_FLOW_TITLE),
                 html.Div("Risk manager approval", style={'fontSize': '11px', 'color': '#888'})
             ], className='flow-node'),
             html.Div([
-                html.Div("4. EXECUTION", style={'fontWeight': '600', 'fontSize': '12px', 'marginBottom': '5px'}),
-                html.Div(f"{len([d for d in pending_decisions if not d.get('executed')])} pending", style={'fontSize': '11px', 'color': '#888'})
+                html.Div("4. EXECUTION", style=STYLE_FLOW_TITLE),
+                html.Div(f"{pending_count} pending", style={'fontSize': '11px', 'color': '#888'})
             ], className='flow-node')
         ], className='orchestrator-flow')
     ])
     
-    # Pending Decisions Queue
-    pending_viz = html.Div([
-        html.Div("⏳ PENDING QUEUE", style={'fontSize': '13px', 'fontWeight': '600', 'color': '#ff9800', 'marginTop': '20px', 'marginBottom': '15px'}),
-        html.Div([
-            html.Div([
-                html.Div([
-                    html.Span(d.get('agent', 'unknown').replace('_', ' ').upper(), style={'fontWeight': '600', 'fontSize': '11px', 'color': '#fff'}),
-                    html.Span(f"CONF: {d.get('confidence', 0):.0f}%", style={'float': 'right', 'fontSize': '11px', 'color': '#00ff88'})
-                ]),
-                html.Div(d.get('decision', 'No decision')[:100], style={'fontSize': '11px', 'color': '#888', 'marginTop': '5px'})
-            ], style={
-                'background': 'rgba(255, 152, 0, 0.05)',
-                'padding': '10px',
-                'borderRadius': '4px',
-                'marginBottom': '8px',
-                'borderLeft': '2px solid #ff9800'
-            })
-            for d in pending_decisions[:5]
-        ]) if pending_decisions else html.Div("No pending decisions", style={'color': '#666', 'fontSize': '12px', 'textAlign': 'center', 'padding': '20px'})
-    ])
+    # Pending Decisions Queue (reused as-is while the top of the queue is unchanged)
+    pending_viz = render_pending_queue(tuple(top_pending))
     
     return html.Div([
         html.Div(activity_cards),
@@ -1311,32 +1585,25 @@ def update_orchestrator(n):
 
 @app.callback(
     Output('recent-trades', 'children'),
-    Input('interval-update', 'n_intervals')
+    Input('interval-fast', 'n_intervals')
 )
 def update_recent_trades(n):
     """Update recent trades list"""
     
-    trades = trading_tools.query_trades(limit=20)
+    trades = get_dashboard_snapshot()['trades']
     
     if not trades or 'error' in trades[0]:
-        return html.Div("No recent trades", style={'color': '#666', 'textAlign': 'center', 'padding': '40px'})
+        return html.Div("No recent trades", style=STYLE_EMPTY)
+    
+    timestamps = format_timestamps([t.get('timestamp', '') for t in trades], '%m-%d %H:%M', slice(None, 16))
     
     trade_items = []
-    for trade in trades:
+    for trade, timestamp in zip(trades, timestamps):
         side = trade.get('side', 'unknown')
         symbol = trade.get('symbol', 'N/A')
         price = float(trade.get('price', 0))
         quantity = float(trade.get('quantity', 0))
         exchange = trade.get('exchange', 'N/A')
-        timestamp = trade.get('timestamp', '')
-        
-        if isinstance(timestamp, str):
-            try:
-                timestamp = datetime.fromisoformat(timestamp).strftime('%m-%d %H:%M')
-            except:
-                timestamp = str(timestamp)[:16] if len(str(timestamp)) >= 16 else str(timestamp)
-        else:
-            timestamp = str(timestamp)
         
         trade_item = html.Div([
             html.Div([
@@ -1358,63 +1625,56 @@ def update_recent_trades(n):
     
     return html.Div(trade_items)
 
+PERF_NUMERIC_COLUMNS = ['total_decisions', 'executed_decisions', 'avg_confidence', 'win_rate', 'total_pnl']
+
 @app.callback(
     Output('agent-performance', 'children'),
-    Input('interval-update', 'n_intervals')
+    Input('interval-slow', 'n_intervals')
 )
 def update_agent_performance(n):
     """Update agent performance metrics"""
     
-    performance = trading_tools.get_agent_performance(days=7)
+    performance = get_dashboard_snapshot()['agent_performance']
     
     if not performance or 'error' in performance[0]:
-        return html.Div("No performance data available", style={'color': '#666', 'textAlign': 'center', 'padding': '40px'})
+        return html.Div("No performance data available", style=STYLE_EMPTY)
+    
+    # Normalize all agents at once; agents without closed positions have no win_rate/total_pnl
+    df = pd.DataFrame(performance).reindex(columns=['agent'] + PERF_NUMERIC_COLUMNS)
+    df['agent'] = df['agent'].fillna('unknown').str.replace('_', ' ').str.upper()
+    df[PERF_NUMERIC_COLUMNS] = df[PERF_NUMERIC_COLUMNS].apply(pd.to_numeric, errors='coerce').fillna(0)
+    df[['total_decisions', 'executed_decisions']] = df[['total_decisions', 'executed_decisions']].astype(int)
+    
+    # Performance badge and P&L colour
+    df['badge'] = np.select(
+        [df['win_rate'] >= 70, df['win_rate'] >= 55, df['win_rate'] >= 40],
+        ['excellent', 'good', 'average'],
+        default='poor'
+    )
+    df['pnl_style'] = (df['total_pnl'] >= 0).map({True: STYLE_PNL_UP_MONO_11, False: STYLE_PNL_DOWN_MONO_11})
     
     perf_cards = []
-    for perf in performance:
-        agent_name = perf.get('agent', 'unknown').replace('_', ' ').upper()
-        total_decisions = perf.get('total_decisions', 0)
-        executed = perf.get('executed_decisions', 0)
-        avg_conf = perf.get('avg_confidence', 0)
-        win_rate = perf.get('win_rate', 0)
-        total_pnl = perf.get('total_pnl', 0)
-        
-        # Performance badge
-        if win_rate >= 70:
-            badge_class = "excellent"
-        elif win_rate >= 55:
-            badge_class = "good"
-        elif win_rate >= 40:
-            badge_class = "average"
-        else:
-            badge_class = "poor"
-        
+    for agent_name, total_decisions, executed, avg_conf, win_rate, total_pnl, badge_class, pnl_style in df.itertuples(index=False):
         perf_card = html.Div([
             html.Div([
-                html.Span(agent_name, style={'fontWeight': '600', 'fontSize': '13px'}),
-                html.Span(f"{win_rate:.0f}%", className=f'perf-badge {badge_class}', style={'float': 'right'})
+                html.Span(agent_name, style=STYLE_PERF_NAME),
+                html.Span(f"{win_rate:.0f}%", className=f'perf-badge {badge_class}', style=STYLE_FLOAT_RIGHT)
             ]),
             html.Div([
                 html.Div([
-                    html.Span("DECISIONS: ", style={'color': '#888', 'fontSize': '11px'}),
-                    html.Span(f"{executed}/{total_decisions}", style={'color': '#fff', 'fontSize': '11px', 'fontFamily': 'JetBrains Mono, monospace'})
-                ], style={'marginTop': '8px'}),
+                    html.Span("DECISIONS: ", style=STYLE_LABEL_11),
+                    html.Span(f"{executed}/{total_decisions}", style=STYLE_VALUE_MONO_11)
+                ], style=STYLE_MARGIN_TOP_8),
                 html.Div([
-                    html.Span("AVG CONF: ", style={'color': '#888', 'fontSize': '11px'}),
-                    html.Span(f"{avg_conf:.1f}%", style={'color': '#00d4ff', 'fontSize': '11px', 'fontFamily': 'JetBrains Mono, monospace'})
-                ], style={'marginTop': '5px'}),
+                    html.Span("AVG CONF: ", style=STYLE_LABEL_11),
+                    html.Span(f"{avg_conf:.1f}%", style=STYLE_CONF_MONO_11)
+                ], style=STYLE_MARGIN_TOP_5),
                 html.Div([
-                    html.Span("P&L: ", style={'color': '#888', 'fontSize': '11px'}),
-                    html.Span(f"${total_pnl:+,.2f}", style={'color': '#00ff88' if total_pnl >= 0 else '#ff5252', 'fontSize': '11px', 'fontFamily': 'JetBrains Mono, monospace'})
-                ], style={'marginTop': '5px'}) if total_pnl != 0 else html.Div()
+                    html.Span("P&L: ", style=STYLE_LABEL_11),
+                    html.Span(f"${total_pnl:+,.2f}", style=pnl_style)
+                ], style=STYLE_MARGIN_TOP_5) if total_pnl != 0 else html.Div()
             ])
-        ], style={
-            'background': 'rgba(0, 0, 0, 0.3)',
-            'padding': '15px',
-            'borderRadius': '6px',
-            'marginBottom': '12px',
-            'border': '1px solid #2d3748'
-        })
+        ], style=STYLE_CARD)
         
         perf_cards.append(perf_card)
     
@@ -1422,15 +1682,15 @@ def update_agent_performance(n):
 
 @app.callback(
     Output('risk-dashboard', 'children'),
-    Input('interval-update', 'n_intervals')
+    Input('interval-slow', 'n_intervals')
 )
 def update_risk_dashboard(n):
     """Update risk metrics dashboard"""
     
-    risk_analysis = trading_tools.get_risk_analysis(days=7)
+    risk_analysis = get_dashboard_snapshot()['risk_analysis']
     
     if 'error' in risk_analysis:
-        return html.Div("No risk data available", style={'color': '#666', 'textAlign': 'center', 'padding': '40px'})
+        return html.Div("No risk data available", style=STYLE_EMPTY)
     
     avg_daily_pnl = risk_analysis.get('avg_daily_pnl', 0)
     max_gain = risk_analysis.get('max_daily_gain', 0)
@@ -1444,111 +1704,97 @@ def update_risk_dashboard(n):
         html.Div([
             html.Div([
                 html.Div("AVG DAILY P&L", className='metric-label'),
-                html.Div(f"${avg_daily_pnl:+,.2f}", style={
-                    'fontSize': '20px',
-                    'fontWeight': '700',
-                    'color': '#00ff88' if avg_daily_pnl >= 0 else '#ff5252',
-                    'fontFamily': 'JetBrains Mono, monospace'
-                })
-            ], style={'marginBottom': '20px'}),
+                html.Div(f"${avg_daily_pnl:+,.2f}", style=STYLE_RISK_HEADLINE_UP if avg_daily_pnl >= 0 else STYLE_RISK_HEADLINE_DOWN)
+            ], style=STYLE_MARGIN_BOTTOM_20),
             
             html.Div([
                 html.Div("MAX DAILY GAIN", className='metric-label'),
-                html.Div(f"${max_gain:+,.2f}", style={
-                    'fontSize': '18px',
-                    'fontWeight': '600',
-                    'color': '#00ff88',
-                    'fontFamily': 'JetBrains Mono, monospace'
-                })
-            ], style={'marginBottom': '20px'}),
+                html.Div(f"${max_gain:+,.2f}", style=STYLE_RISK_UP)
+            ], style=STYLE_MARGIN_BOTTOM_20),
             
             html.Div([
                 html.Div("MAX DAILY LOSS", className='metric-label'),
-                html.Div(f"${max_loss:+,.2f}", style={
-                    'fontSize': '18px',
-                    'fontWeight': '600',
-                    'color': '#ff5252',
-                    'fontFamily': 'JetBrains Mono, monospace'
-                })
-            ], style={'marginBottom': '20px'}),
+                html.Div(f"${max_loss:+,.2f}", style=STYLE_RISK_DOWN)
+            ], style=STYLE_MARGIN_BOTTOM_20),
             
             html.Div([
                 html.Div("WORST DRAWDOWN", className='metric-label'),
-                html.Div(f"{worst_drawdown:+,.2f}%", style={
-                    'fontSize': '18px',
-                    'fontWeight': '600',
-                    'color': '#ff5252',
-                    'fontFamily': 'JetBrains Mono, monospace'
-                })
-            ], style={'marginBottom': '20px'}),
+                html.Div(f"{worst_drawdown:+,.2f}%", style=STYLE_RISK_DOWN)
+            ], style=STYLE_MARGIN_BOTTOM_20),
             
             html.Div([
                 html.Div("SHARPE RATIO", className='metric-label'),
-                html.Div(f"{sharpe:.2f}", style={
-                    'fontSize': '18px',
-                    'fontWeight': '600',
-                    'color': '#00d4ff',
-                    'fontFamily': 'JetBrains Mono, monospace'
-                })
-            ], style={'marginBottom': '20px'}),
+                html.Div(f"{sharpe:.2f}", style=STYLE_RISK_INFO)
+            ], style=STYLE_MARGIN_BOTTOM_20),
             
             html.Div([
                 html.Div("WIN RATE", className='metric-label'),
-                html.Div(f"{win_rate:.1f}%", style={
-                    'fontSize': '18px',
-                    'fontWeight': '600',
-                    'color': '#00ff88' if win_rate >= 50 else '#ff9800',
-                    'fontFamily': 'JetBrains Mono, monospace'
-                })
+                html.Div(f"{win_rate:.1f}%", style=STYLE_RISK_UP if win_rate >= 50 else STYLE_RISK_WARN)
             ])
         ])
     ])
     
     return risk_display
 
+def chat_cache_key(user_message, conversation_history):
+    """Cache key for a chat turn: normalized prompt plus a digest of the recent history"""
+    history_digest = hashlib.blake2b(
+        json.dumps(conversation_history[-6:], sort_keys=True).encode(),
+        digest_size=16
+    ).hexdigest()
+    return user_message.strip().lower(), history_digest
+
+def cached_chat_reply(user_message, conversation_history, on_delta):
+    """GPT-4o reply for a chat turn, served from the reply cache when the same turn was just asked"""
+    key = chat_cache_key(user_message, conversation_history)
+    reply = chat_reply_cache.get(key)
+    if reply is None:
+        reply = chat_with_gpt4o(user_message, conversation_history, on_delta=on_delta)
+        if not reply.startswith('Error'):
+            chat_reply_cache.set(key, reply, expire=CHAT_CACHE_TTL)
+    return reply
+
 @app.callback(
     [Output('chat-history', 'children'),
      Output('chat-input', 'value'),
      Output('chat-store', 'data')],
-    [Input('chat-send', 'n_clicks')],
+    Input('chat-send', 'n_clicks'),
     [State('chat-input', 'value'),
-     State('chat-store', 'data')]
+     State('chat-store', 'data')],
+    background=True,
+    manager=background_manager,
+    running=[(Output('chat-send', 'disabled'), True, False)],
+    progress=Output('chat-pending', 'children'),
+    progress_default=None,
+    interval=300,
+    prevent_initial_call=True
 )
-def handle_chat(n_clicks, user_message, conversation_history):
-    """Handle chat with GPT-4o function calling"""
+def handle_chat(set_progress, n_clicks, user_message, conversation_history):
+    """Handle chat with GPT-4o function calling, streaming the reply as it arrives"""
     
-    if not user_message or n_clicks == 0:
-        welcome_msg = html.Div([
-            html.Div([
-                html.Div("AI ASSISTANT", className='chat-message-header'),
-                html.Div("👋 Hello! I'm your AI trading assistant powered by GPT-4o with full database access. I can analyze trades, explain agent decisions, provide market insights, and answer questions about your portfolio. What would you like to know?", 
-                        className='chat-message-content')
-            ], className='chat-message assistant')
-        ])
-        return welcome_msg, "", []
+    # Ignore empty submits; the send button stays disabled while a reply is running
+    if not user_message or not user_message.strip():
+        return no_update, no_update, no_update
     
-    # Get LLM response with function calling
-    llm_response = chat_with_gpt4o(user_message, conversation_history)
+    question = {'role': 'user', 'content': user_message}
+    set_progress(render_chat([question, {'role': 'assistant', 'content': '…'}]))
     
-    # Update conversation history
-    conversation_history.append({'role': 'user', 'content': user_message})
-    conversation_history.append({'role': 'assistant', 'content': llm_response})
+    partial = []
+    last_push = time.monotonic()
     
-    # Keep only last 10 messages
-    if len(conversation_history) > 10:
-        conversation_history = conversation_history[-10:]
+    def on_delta(text):
+        nonlocal last_push
+        partial.append(text)
+        now = time.monotonic()
+        if now - last_push >= CHAT_PROGRESS_INTERVAL:
+            last_push = now
+            set_progress(render_chat([question, {'role': 'assistant', 'content': ''.join(partial)}]))
     
-    # Display chat messages
-    chat_display = []
-    for msg in conversation_history:
-        is_user = msg['role'] == 'user'
-        chat_msg = html.Div([
-            html.Div("YOU" if is_user else "AI ASSISTANT", className='chat-message-header'),
-            html.Div(msg['content'], className='chat-message-content')
-        ], className=f'chat-message {"" if is_user else "assistant"}')
-        chat_display.append(chat_msg)
+    reply = cached_chat_reply(user_message, conversation_history, on_delta)
     
-    return html.Div(chat_display), "", conversation_history
+    # Keep only last 10 messages
+    conversation_history = (conversation_history + [question, {'role': 'assistant', 'content': reply}])[-10:]
+    return render_chat(conversation_history), "", conversation_history
 
 if __name__ == '__main__':
     print("=" * 100)
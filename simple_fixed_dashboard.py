@@ -2,121 +2,394 @@
 """
 Simple Fixed Dashboard - Shows REAL Exchange Balances
 """
-from flask import Flask, render_template_string
-import ccxt
+from flask import Flask, Response, request
+from gunicorn.app.base import BaseApplication
+import ccxt.async_support as ccxt_async
+import ccxt.pro as ccxtpro
+import aiohttp
+import asyncio
+import atexit
+import gzip
+import hashlib
+import re
 import json
 from datetime import datetime
 import time
 import threading
+import numpy as np
+
+# orjson is several times faster at both directions; fall back to the stdlib if it's missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load configuration
-with open('/opt/crypto-trading/config.json', 'r') as f:
-    config = json.load(f)
+with open('/opt/crypto-trading/config.json', 'rb') as f:
+    config = orjson.loads(f.read()) if orjson else json.load(f)
 
 STARTING_CAPITAL = 100.0
+STARTING_CAPITAL_STR = f"{STARTING_CAPITAL:,.2f}"
 
-# Global cache for exchange data
+# Global cache for exchange data. Never mutated: publish() swaps in a complete new dict, so a
+# reader that takes `snapshot = data_cache` always sees one consistent set of values
 data_cache = {
     'kraken_balance': 0.0,
+    'kraken_balance_str': '0.00',
     'kraken_status': 'Loading...',
     'kraken_holdings': [],
     'binance_balance': 0.0,
+    'binance_balance_str': '0.00',
     'binance_status': 'Loading...',
     'binance_holdings': [],
     'last_update': 'Never',
     'total_value': 0.0,
+    'total_value_str': '0.00',
     'pnl': 0.0,
-    'pnl_pct': 0.0
+    'pnl_str': '+0.00',
+    'pnl_pct': 0.0,
+    'pnl_pct_str': '+0.00%'
 }
 
-def get_exchange_balance(exchange_name, api_key, api_secret):
-    """Get balance from exchange"""
-    try:
-        if exchange_name.lower() == 'kraken':
-            exchange = ccxt.kraken({
-                'apiKey': api_key,
-                'secret': api_secret,
-                'enableRateLimit': True
-            })
+# Exchange clients are built once so their HTTP sessions are reused across refreshes.
+# The ccxt.pro classes keep the REST methods and add the WebSocket watch_* streams
+kraken = ccxtpro.kraken({
+    'apiKey': config.get('kraken_api_key', ''),
+    'secret': config.get('kraken_api_secret', ''),
+    'enableRateLimit': True,
+    'timeout': 5000  # a slow exchange must not stall the whole 15s cycle
+})
+binance = ccxtpro.binance({
+    'apiKey': config.get('binance_api_key', ''),
+    'secret': config.get('binance_api_secret', ''),
+    'enableRateLimit': True,
+    'timeout': 5000
+})
+EXCHANGES = [kraken, binance]
+
+# Holdings priced at $1, and the currency every other holding is priced against
+STABLES = frozenset({'USD', 'USDT', 'USDC', 'DAI', 'BUSD'})
+QUOTES = {'kraken': 'USD', 'binance': 'USDT'}
+
+# Prices are reused across refreshes for a minute; the page only needs them roughly current
+TICKER_TTL = 60.0
+ticker_cache = {}  # (exchange id, symbol) -> (last price, time.monotonic() when fetched)
+
+# Last balance fetched from each exchange, so streamed prices can be applied without refetching it
+last_balances = {exchange.id: ([], 'Loading...') for exchange in EXCHANGES}  # id -> (held [(currency, amount)], status)
+watched_symbols = {}  # exchange id -> symbols priced from the ticker stream
+
+# Streamed prices are batched: the stream only marks them dirty, and run_updates republishes
+# at most once per PUBLISH_INTERVAL, so the page (and its ETag) isn't rebuilt per ticker message
+PUBLISH_INTERVAL = 2
+prices_dirty = False
+
+# Geo-blocked exchanges and rejected keys won't fix themselves in 15s: retry them with
+# exponential backoff and keep showing the last result in between
+MAX_BACKOFF = 600
+backoff_delay = {}  # exchange id -> current backoff in seconds
+next_try_at = {}  # exchange id -> time.monotonic() before which the exchange is skipped
+
+# Transient failures (timeouts, 429s, 5xx) are retried before a refresh gives up on an exchange
+RETRIES = 3
+RETRY_BACKOFF = 0.25
+
+async def with_retries(call, *args):
+    """Await an idempotent exchange read, retrying transient network errors with backoff"""
+    for attempt in range(RETRIES):
+        try:
+            return await call(*args)
+        except ccxt_async.NetworkError as e:
+            # A geo-block comes back as a 451 and will not clear on retry
+            if attempt == RETRIES - 1 or "restricted location" in str(e).lower():
+                raise
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+# Listed markets change rarely; reload them hourly to pick up new listings
+MARKETS_TTL = 3600
+markets_loaded_at = {}  # exchange id -> time.monotonic() of the last load_markets
+
+async def get_markets(exchange):
+    """Exchange markets keyed by symbol, reloaded at most once per MARKETS_TTL"""
+    loaded_at = markets_loaded_at.get(exchange.id)
+    if loaded_at is None or time.monotonic() - loaded_at >= MARKETS_TTL:
+        await with_retries(exchange.load_markets, True)
+        markets_loaded_at[exchange.id] = time.monotonic()
+    return exchange.markets
+
+async def get_prices(exchange, symbols):
+    """Last prices for symbols, fetching only those not cached within TICKER_TTL"""
+    now = time.monotonic()
+    prices = {}
+    stale = []
+    for symbol in symbols:
+        cached = ticker_cache.get((exchange.id, symbol))
+        if cached and now - cached[1] < TICKER_TTL:
+            prices[symbol] = cached[0]
         else:
-            exchange = ccxt.binance({
-                'apiKey': api_key,
-                'secret': api_secret,
-                'enableRateLimit': True
-            })
+            stale.append(symbol)
+    
+    if stale:
+        tickers = await with_retries(exchange.fetch_tickers, stale)
         
-        balance = exchange.fetch_balance()
-        total_usd = 0.0
-        holdings = []
+        now = time.monotonic()
+        for symbol in stale:
+            price = tickers.get(symbol, {}).get('last')
+            if price:
+                prices[symbol] = price
+                ticker_cache[(exchange.id, symbol)] = (price, now)
+            else:
+                ticker_cache.pop((exchange.id, symbol), None)
+    
+    return prices
+
+# Dust isn't worth a ticker request: holdings under DUST_THRESHOLD USD at their last known price
+# keep that price, and amounts under DUST_AMOUNT with no known price are left unpriced
+DUST_THRESHOLD = 0.10
+DUST_AMOUNT = 1e-8
+
+def needs_price(exchange, symbol, amount):
+    """Whether a holding is worth fetching or streaming a ticker for"""
+    cached = ticker_cache.get((exchange.id, symbol))
+    if cached is None:
+        return amount >= DUST_AMOUNT
+    return amount * cached[0] >= DUST_THRESHOLD
+
+async def get_exchange_balance(exchange):
+    """Get balance from exchange and make sure its holdings have current prices cached"""
+    if not exchange.apiKey or not exchange.secret:
+        return [], "No API keys ⚙️"
+    if time.monotonic() < next_try_at.get(exchange.id, 0):
+        return last_balances[exchange.id]
+    
+    try:
+        balance = await with_retries(exchange.fetch_balance)
+        held = [(currency, amount) for currency, amount in balance['total'].items() if amount > 0]
         
-        for currency, amount in balance['total'].items():
-            if amount > 0:
-                if currency in ['USD', 'USDT', 'USDC']:
-                    usd_value = amount
-                else:
-                    try:
-                        symbol = f"{currency}/USDT" if exchange_name == "Binance" else f"{currency}/USD"
-                        ticker = exchange.fetch_ticker(symbol)
-                        usd_value = amount * ticker['last']
-                    except:
-                        usd_value = 0
-                
-                total_usd += usd_value
-                holdings.append({
-                    'currency': currency,
-                    'amount': amount,
-                    'usd_value': usd_value
-                })
+        # Holdings without a market against the quote currency are valued at $0 without asking
+        quote = QUOTES[exchange.id]
+        markets = await get_markets(exchange)
+        symbols = [
+            f"{currency}/{quote}" for currency, amount in held
+            if currency not in STABLES
+            and f"{currency}/{quote}" in markets
+            and needs_price(exchange, f"{currency}/{quote}", amount)
+        ]
+        await get_prices(exchange, symbols)
+        watched_symbols[exchange.id] = symbols
+        backoff_delay.pop(exchange.id, None)
         
-        return total_usd, "Connected ✅", holdings
+        return held, "Connected ✅"
         
     except Exception as e:
         error_msg = str(e)
-        if "restricted location" in error_msg.lower():
-            return 0.0, "GEO-BLOCKED 🚫", []
+        geo_blocked = "restricted location" in error_msg.lower()
+        if geo_blocked or isinstance(e, (ccxt_async.AuthenticationError, ccxt_async.PermissionDenied)):
+            delay = min(backoff_delay.get(exchange.id, 15) * 2, MAX_BACKOFF)
+            backoff_delay[exchange.id] = delay
+            next_try_at[exchange.id] = time.monotonic() + delay
+        
+        if geo_blocked:
+            return [], "GEO-BLOCKED 🚫"
         else:
-            return 0.0, f"Error ❌", []
+            return [], f"Error ❌"
 
-def update_data():
-    """Background thread to update exchange data"""
+def value_holdings(exchange, held):
+    """USD total and per-holding rows for a balance, from the cached prices"""
+    if not held:
+        return 0.0, []
+    
+    quote = QUOTES[exchange.id]
+    # Parallel arrays: one multiply and one sum over all holdings, unpriced ones count as $0
+    currencies = [currency for currency, _ in held]
+    amounts = np.fromiter((amount for _, amount in held), dtype=np.float64, count=len(held))
+    prices = np.fromiter(
+        (1.0 if currency in STABLES
+         else ticker_cache.get((exchange.id, f"{currency}/{quote}"), (0.0,))[0] or 0.0
+         for currency in currencies),
+        dtype=np.float64, count=len(held)
+    )
+    usd_values = amounts * prices
+    
+    holdings = [
+        {
+            'currency': currency,
+            'amount': amount,
+            'usd_value': usd_value,
+            'amount_str': f"{amount:.8f}",
+            'usd_value_str': f"{usd_value:,.2f}"
+        }
+        for currency, amount, usd_value in zip(currencies, amounts.tolist(), usd_values.tolist())
+    ]
+    return float(usd_values.sum()), holdings
+
+def publish():
+    """Rebuild the cache and the rendered page from the last balances and the latest cached prices"""
+    global data_cache, rendered_page, rendered_state
+    cache = {}
+    total_value = 0.0
+    for exchange in EXCHANGES:
+        held, status = last_balances[exchange.id]
+        balance, holdings = value_holdings(exchange, held)
+        total_value += balance
+        cache.update({
+            f'{exchange.id}_balance': balance,
+            f'{exchange.id}_balance_str': f"{balance:,.2f}",
+            f'{exchange.id}_status': status,
+            f'{exchange.id}_holdings': holdings
+        })
+    
+    # Update cache
+    pnl = total_value - STARTING_CAPITAL
+    pnl_pct = (pnl / STARTING_CAPITAL) * 100 if STARTING_CAPITAL > 0 else 0
+    
+    cache.update({
+        'last_update': datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
+        'total_value': total_value,
+        'total_value_str': f"{total_value:,.2f}",
+        'pnl': pnl,
+        'pnl_str': f"{pnl:+,.2f}",
+        'pnl_pct': pnl_pct,
+        'pnl_pct_str': f"{pnl_pct:+.2f}%"
+    })
+    data_cache = cache
+    rendered_page = render_page(data_cache)
+    rendered_state = render_state(data_cache)
+
+# Upper bound on one exchange's refresh, retries included, so a stuck one can't hold up the page
+EXCHANGE_REFRESH_TIMEOUT = 8
+
+async def refresh_exchange(exchange):
+    """get_exchange_balance, keeping the previous holdings if it runs past the timeout"""
+    try:
+        return await asyncio.wait_for(get_exchange_balance(exchange), EXCHANGE_REFRESH_TIMEOUT)
+    except asyncio.TimeoutError:
+        return last_balances[exchange.id][0], "Timeout ⏱️"
+
+async def refresh():
+    """Fetch every exchange balance concurrently and update the cache"""
+    global prices_dirty, last_refresh_at
+    last_refresh_at = time.monotonic()
+    results = await asyncio.gather(*(refresh_exchange(exchange) for exchange in EXCHANGES))
+    last_balances.update(zip((exchange.id for exchange in EXCHANGES), results))
+    prices_dirty = False
+    publish()
+
+async def watch_prices(exchange):
+    """Stream ticker updates for the held symbols into ticker_cache and mark them for publishing"""
+    global prices_dirty
+    if not exchange.has.get('watchTickers'):
+        return  # prices keep coming from the REST refresh
+    
+    backoff = 1
     while True:
+        symbols = watched_symbols.get(exchange.id)
+        if not symbols:
+            await asyncio.sleep(15)
+            continue
+        
         try:
-            # Get Kraken data
-            kraken_balance, kraken_status, kraken_holdings = get_exchange_balance(
-                'Kraken',
-                config.get('kraken_api_key', ''),
-                config.get('kraken_api_secret', '')
-            )
-            
-            # Get Binance data
-            binance_balance, binance_status, binance_holdings = get_exchange_balance(
-                'Binance',
-                config.get('binance_api_key', ''),
-                config.get('binance_api_secret', '')
-            )
-            
-            # Update cache
-            total_value = kraken_balance + binance_balance
-            pnl = total_value - STARTING_CAPITAL
-            pnl_pct = (pnl / STARTING_CAPITAL) * 100 if STARTING_CAPITAL > 0 else 0
-            
-            data_cache.update({
-                'kraken_balance': kraken_balance,
-                'kraken_status': kraken_status,
-                'kraken_holdings': kraken_holdings,
-                'binance_balance': binance_balance,
-                'binance_status': binance_status,
-                'binance_holdings': binance_holdings,
-                'last_update': datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
-                'total_value': total_value,
-                'pnl': pnl,
-                'pnl_pct': pnl_pct
-            })
-            
+            tickers = await exchange.watch_tickers(symbols)
+        except ccxt_async.NetworkError:
+            # Dropped or refused connection: reconnect with exponential backoff
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 300)
+            continue
         except Exception as e:
-            print(f"Error updating data: {e}")
+            print(f"Error streaming {exchange.id} tickers: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 300)
+            continue
         
-        time.sleep(15)  # Update every 15 seconds
+        backoff = 1
+        now = time.monotonic()
+        for symbol, ticker in tickers.items():
+            if ticker.get('last'):
+                ticker_cache[(exchange.id, symbol)] = (ticker['last'], now)
+        prices_dirty = True
+
+async def wait_for_refresh(timeout):
+    """Wait up to timeout for /refresh, publishing streamed prices every PUBLISH_INTERVAL meanwhile"""
+    global prices_dirty
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            await asyncio.wait_for(refresh_requested.wait(), min(PUBLISH_INTERVAL, remaining))
+            return
+        except asyncio.TimeoutError:
+            pass
+        if prices_dirty:
+            prices_dirty = False
+            publish()
+
+async def run_updates():
+    """Refresh loop; closes the exchange sessions when cancelled"""
+    global refresh_requested
+    refresh_requested = asyncio.Event()
+    # One pooled keep-alive session for both clients. aiohttp's default 15s keep-alive would
+    # drop every connection during the 15s sleep and pay a new TLS handshake each refresh
+    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+        limit=16,
+        keepalive_timeout=75,
+        ttl_dns_cache=300
+    ))
+    for exchange in EXCHANGES:
+        exchange.session = session
+    watchers = [asyncio.create_task(watch_prices(exchange)) for exchange in EXCHANGES]
+    try:
+        while True:
+            try:
+                await refresh()
+            except Exception as e:
+                print(f"Error updating data: {e}")
+            
+            # Refresh balances every 15 seconds (prices stream in between), or right away on /refresh
+            await wait_for_refresh(15)
+            refresh_requested.clear()
+    finally:
+        for watcher in watchers:
+            watcher.cancel()
+        await asyncio.gather(*watchers, return_exceptions=True)
+        await asyncio.gather(*(exchange.close() for exchange in EXCHANGES))
+        await session.close()
+
+update_loop = None
+update_task = None
+refresh_requested = None  # asyncio.Event on update_loop that cuts the wait short
+
+# /refresh hits every exchange API with our keys, so forced refreshes are refused within
+# REFRESH_MIN_INTERVAL seconds of the last refresh (scheduled or forced)
+REFRESH_MIN_INTERVAL = 10
+last_refresh_at = None  # time.monotonic() when refresh() last started
+
+def update_data():
+    """Background thread to update exchange data"""
+    global update_loop, update_task
+    update_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(update_loop)
+    update_task = update_loop.create_task(run_updates())
+    try:
+        update_loop.run_until_complete(update_task)
+    except asyncio.CancelledError:
+        pass
+
+def stop_updates(update_thread):
+    """Cancel the refresh loop and give it a moment to close the exchange sessions"""
+    if update_task:
+        update_loop.call_soon_threadsafe(update_task.cancel)
+    update_thread.join(timeout=5)
+
+def start_updates():
+    """Start the background update thread in this process"""
+    update_thread = threading.Thread(target=update_data, daemon=True)
+    update_thread.start()
+    atexit.register(stop_updates, update_thread)
+    
+    # Give it a moment to fetch initial data
+    time.sleep(2)
 
 # HTML Template
 HTML_TEMPLATE = '''
@@ -124,7 +397,6 @@ HTML_TEMPLATE = '''
 <html>
 <head>
     <title>Crypto Trading Dashboard - REAL DATA</title>
-    <meta http-equiv="refresh" content="15">
     <style>
         body {
             background-color: #0a0a0a;
@@ -218,65 +490,112 @@ HTML_TEMPLATE = '''
         
         <div class="card">
             <h2>💰 Total Portfolio Value</h2>
-            <div class="big-value {{ 'positive' if pnl >= 0 else 'negative' }}">
-                ${{ "%.2f"|format(total_value) }}
+            <div id="total-value" class="big-value {{ 'positive' if pnl >= 0 else 'negative' }}">
+                ${{ total_value_str }}
             </div>
-            <div style="font-size: 24px;" class="{{ 'positive' if pnl >= 0 else 'negative' }}">
-                {{ "%.2f"|format(pnl) if pnl >= 0 else "%.2f"|format(pnl) }} 
-                ({{ "%.2f"|format(pnl_pct) }}%)
+            <div id="pnl" style="font-size: 24px;" class="{{ 'positive' if pnl >= 0 else 'negative' }}">
+                {{ pnl_str }} ({{ pnl_pct_str }})
             </div>
             <p style="color: #888; margin-top: 15px;">
-                Starting Capital: ${{ "%.2f"|format(starting_capital) }}
+                Starting Capital: ${{ starting_capital }}
             </p>
         </div>
         
         <div class="exchange-grid">
             <div class="card">
                 <h3>🔹 Kraken Exchange</h3>
-                <div class="big-value neutral">${{ "%.2f"|format(kraken_balance) }}</div>
-                <span class="status-badge {{ 'status-connected' if 'Connected' in kraken_status else 'status-error' }}">
+                <div id="kraken-balance" class="big-value neutral">${{ kraken_balance_str }}</div>
+                <span id="kraken-status" class="status-badge {{ 'status-connected' if 'Connected' in kraken_status else 'status-error' }}">
                     {{ kraken_status }}
                 </span>
-                {% if kraken_holdings %}
-                <table>
-                    <tr><th>Asset</th><th>Amount</th><th>Value (USD)</th></tr>
+                <table id="kraken-table"{% if not kraken_holdings %} hidden{% endif %}>
+                    <thead><tr><th>Asset</th><th>Amount</th><th>Value (USD)</th></tr></thead>
+                    <tbody id="kraken-holdings">
                     {% for h in kraken_holdings %}
                     <tr>
                         <td>{{ h['currency'] }}</td>
-                        <td>{{ "%.8f"|format(h['amount']) }}</td>
-                        <td class="positive">${{ "%.2f"|format(h['usd_value']) }}</td>
+                        <td>{{ h['amount_str'] }}</td>
+                        <td class="positive">${{ h['usd_value_str'] }}</td>
                     </tr>
                     {% endfor %}
+                    </tbody>
                 </table>
-                {% endif %}
             </div>
             
             <div class="card">
                 <h3>🔸 Binance Exchange</h3>
-                <div class="big-value neutral">${{ "%.2f"|format(binance_balance) }}</div>
-                <span class="status-badge {{ 'status-connected' if 'Connected' in binance_status else 'status-error' }}">
+                <div id="binance-balance" class="big-value neutral">${{ binance_balance_str }}</div>
+                <span id="binance-status" class="status-badge {{ 'status-connected' if 'Connected' in binance_status else 'status-error' }}">
                     {{ binance_status }}
                 </span>
-                {% if binance_holdings %}
-                <table>
-                    <tr><th>Asset</th><th>Amount</th><th>Value (USD)</th></tr>
+                <table id="binance-table"{% if not binance_holdings %} hidden{% endif %}>
+                    <thead><tr><th>Asset</th><th>Amount</th><th>Value (USD)</th></tr></thead>
+                    <tbody id="binance-holdings">
                     {% for h in binance_holdings %}
                     <tr>
                         <td>{{ h['currency'] }}</td>
-                        <td>{{ "%.8f"|format(h['amount']) }}</td>
-                        <td class="positive">${{ "%.2f"|format(h['usd_value']) }}</td>
+                        <td>{{ h['amount_str'] }}</td>
+                        <td class="positive">${{ h['usd_value_str'] }}</td>
                     </tr>
                     {% endfor %}
+                    </tbody>
                 </table>
-                {% endif %}
             </div>
         </div>
         
         <div class="footer">
-            Last Updated: {{ last_update }} | Auto-refresh every 15 seconds<br>
+            Last Updated: <span id="last-update">{{ last_update }}</span> | Auto-refresh every 15 seconds<br>
             System Status: REAL TRADING MODE | Starting Capital: $100.00
         </div>
     </div>
+    <script>
+        // Poll the JSON state and patch the numbers in place instead of reloading the page
+        function escapeHtml(text) {
+            var div = document.createElement('div');
+            div.textContent = text;
+            return div.innerHTML;
+        }
+        
+        function setSign(el, value) {
+            el.classList.toggle('positive', value >= 0);
+            el.classList.toggle('negative', value < 0);
+        }
+        
+        function render(state) {
+            var total = document.getElementById('total-value');
+            var pnl = document.getElementById('pnl');
+            total.textContent = '$' + state.total_value_str;
+            pnl.textContent = state.pnl_str + ' (' + state.pnl_pct_str + ')';
+            setSign(total, state.pnl);
+            setSign(pnl, state.pnl);
+            
+            ['kraken', 'binance'].forEach(function(exchange) {
+                var status = document.getElementById(exchange + '-status');
+                var holdings = state[exchange + '_holdings'];
+                document.getElementById(exchange + '-balance').textContent = '$' + state[exchange + '_balance_str'];
+                status.textContent = state[exchange + '_status'];
+                status.className = 'status-badge ' + (state[exchange + '_status'].indexOf('Connected') >= 0 ? 'status-connected' : 'status-error');
+                document.getElementById(exchange + '-table').hidden = holdings.length === 0;
+                document.getElementById(exchange + '-holdings').innerHTML = holdings.map(function(h) {
+                    return '<tr><td>' + escapeHtml(h.currency) + '</td><td>' + h.amount_str +
+                        '</td><td class="positive">$' + h.usd_value_str + '</td></tr>';
+                }).join('');
+            });
+            
+            document.getElementById('last-update').textContent = state.last_update;
+        }
+        
+        setInterval(function() {
+            fetch('/api/state', {cache: 'no-cache'})
+                .then(function(response) { return response.ok ? response.json() : null; })
+                .then(function(state) {
+                    if (state) {
+                        requestAnimationFrame(function() { render(state); });
+                    }
+                })
+                .catch(function() {});
+        }, 15000);
+    </script>
 </body>
 </html>
 '''
@@ -284,34 +603,85 @@ HTML_TEMPLATE = '''
 # Create Flask app
 app = Flask(__name__)
 
+class DashboardServer(BaseApplication):
+    """Run the Flask app under gunicorn from this script"""
+    
+    def __init__(self, application, options):
+        self.application = application
+        self.options = options
+        super().__init__()
+    
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+    
+    def load(self):
+        return self.application
+
+# Compiled once, with the indentation stripped (the page has no whitespace-sensitive markup);
+# render_template_string would re-parse the template on every request
+dashboard_template = app.jinja_env.from_string(re.sub(r'\n\s+', '\n', HTML_TEMPLATE))
+
+def render_page(snapshot):
+    """Render the dashboard for a cache snapshot as (html bytes, gzipped bytes, etag, render time)"""
+    html = dashboard_template.render(starting_capital=STARTING_CAPITAL_STR, **snapshot).encode('utf-8')
+    return html, gzip.compress(html, 6), hashlib.md5(html).hexdigest(), time.time()
+
+def render_state(snapshot):
+    """Serialize a cache snapshot for /api/state as (json bytes, etag)"""
+    if orjson:
+        body = orjson.dumps(snapshot, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        body = json.dumps(snapshot).encode('utf-8')
+    return body, hashlib.md5(body).hexdigest()
+
+# Rendered once per publish() and served as-is; rebinding the tuples keeps readers consistent
+rendered_page = render_page(data_cache)
+rendered_state = render_state(data_cache)
+
 @app.route('/')
 def index():
-    """Render dashboard"""
-    return render_template_string(
-        HTML_TEMPLATE,
-        starting_capital=STARTING_CAPITAL,
-        total_value=data_cache['total_value'],
-        pnl=data_cache['pnl'],
-        pnl_pct=data_cache['pnl_pct'],
-        kraken_balance=data_cache['kraken_balance'],
-        kraken_status=data_cache['kraken_status'],
-        kraken_holdings=data_cache['kraken_holdings'],
-        binance_balance=data_cache['binance_balance'],
-        binance_status=data_cache['binance_status'],
-        binance_holdings=data_cache['binance_holdings'],
-        last_update=data_cache['last_update']
-    )
+    """Serve the pre-rendered dashboard, or 304 if the browser already has it"""
+    html, compressed, etag, rendered_at = rendered_page
+    headers = {'Cache-Control': 'max-age=10', 'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.accept_encodings:
+        response = Response(compressed, mimetype='text/html', headers={**headers, 'Content-Encoding': 'gzip'})
+        response.set_etag(f'{etag}-gzip')
+    else:
+        response = Response(html, mimetype='text/html', headers=headers)
+        response.set_etag(etag)
+    response.last_modified = rendered_at
+    return response.make_conditional(request)
+
+@app.route('/api/state')
+def state():
+    """Current cache as JSON for the page's in-place updates"""
+    body, etag = rendered_state
+    response = Response(body, mimetype='application/json', headers={'Cache-Control': 'max-age=10'})
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+@app.route('/refresh', methods=['POST'])
+def force_refresh():
+    """Wake the update loop for an immediate refresh, or 429 if the data is fresh enough"""
+    if last_refresh_at is not None:
+        wait = REFRESH_MIN_INTERVAL - (time.monotonic() - last_refresh_at)
+        if wait > 0:
+            return '', 429, {'Retry-After': str(int(wait) + 1)}
+    if update_loop and refresh_requested:
+        update_loop.call_soon_threadsafe(refresh_requested.set)
+    return '', 204
 
 if __name__ == '__main__':
     print("Starting Simple Fixed Dashboard")
     print(f"Starting Capital: ${STARTING_CAPITAL:.2f}")
     
-    # Start background update thread
-    update_thread = threading.Thread(target=update_data, daemon=True)
-    update_thread.start()
-    
-    # Give it a moment to fetch initial data
-    time.sleep(2)
-    
-    # Run Flask app
-    app.run(host='0.0.0.0', port=3000, debug=False)
+    # Serve with gunicorn's threaded worker so slow clients don't queue behind each other.
+    # One worker: data_cache lives in-process, and the updater starts after the fork
+    DashboardServer(app, {
+        'bind': '0.0.0.0:3000',
+        'workers': 1,
+        'worker_class': 'gthread',
+        'threads': 8,
+        'post_worker_init': lambda worker: start_updates()
+    }).run()
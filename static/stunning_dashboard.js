@@ -0,0 +1,197 @@
+// Stunning dashboard page script, served from /static next to its stylesheet.
+
+function clickHidden(id) {
+    var trigger = document.getElementById(id);
+    if (trigger) {
+        trigger.click();
+    }
+}
+
+// Refresh the data panels (or the chat, on 'chat' events) when the server reports a
+// change; while the tab is hidden the refresh is held back and done once when it is shown
+var pending = {};
+
+function push(id) {
+    if (document.hidden) {
+        pending[id] = true;
+        return;
+    }
+    clickHidden(id);
+}
+
+if (window.EventSource) {
+    var updates = new EventSource('/api/updates');
+    updates.onmessage = function() {
+        push('live-push');
+    };
+    updates.addEventListener('chat', function() {
+        push('chat-push');
+    });
+}
+
+document.addEventListener('visibilitychange', function() {
+    clickHidden('visibility-change');
+    if (!document.hidden) {
+        Object.keys(pending).forEach(clickHidden);
+        pending = {};
+    }
+});
+
+var CHAT_DEBOUNCE_MS = 500;
+var lastSend = 0;
+
+// Card panels: the server ships flat rows and the cards are built here,
+// so the Python callbacks don't serialize a component tree every tick.
+function el(type, className, children, style) {
+    var props = {className: className, children: children};
+    if (style) {
+        props.style = style;
+    }
+    return {type: type, namespace: 'dash_html_components', props: props};
+}
+
+var EMPTY_STYLE = {color: '#666', textAlign: 'center', padding: '20px'};
+var ERROR_STYLE = {color: '#ff5252'};
+
+function pad2(n) {
+    return (n < 10 ? '0' : '') + n;
+}
+
+// MM/DD HH:MM of a trades.timestamp sent as epoch seconds. The column has no time
+// zone, so its wall-clock time is read back in UTC rather than the browser's zone.
+function tradeTime(epoch) {
+    if (epoch == null) {
+        return 'N/A';
+    }
+    var d = new Date(epoch * 1000);
+    return pad2(d.getUTCMonth() + 1) + '/' + pad2(d.getUTCDate()) + ' ' +
+           pad2(d.getUTCHours()) + ':' + pad2(d.getUTCMinutes());
+}
+
+function renderPanel(data, empty, renderRow) {
+    if (!data) {
+        return window.dash_clientside.no_update;
+    }
+    if (data.error) {
+        return el('Div', null, data.error, ERROR_STYLE);
+    }
+    if (!data.length) {
+        return el('Div', null, empty, EMPTY_STYLE);
+    }
+    return el('Div', null, data.map(renderRow));
+}
+
+function agentType(name) {
+    name = name.toLowerCase();
+    if (name.indexOf('execution') !== -1) return 'execution';
+    if (name.indexOf('risk') !== -1) return 'risk';
+    if (name.indexOf('scalp') !== -1) return 'scalping';
+    if (name.indexOf('swing') !== -1) return 'swing';
+    return 'research';
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    stunning: {
+        clock: function() {
+            return new Date().toISOString().replace('T', ' ').slice(0, 19) + ' UTC';
+        },
+        debounceSend: function(n_clicks) {
+            var now = Date.now();
+            if (!n_clicks || now - lastSend < CHAT_DEBOUNCE_MS) {
+                return window.dash_clientside.no_update;
+            }
+            lastSend = now;
+            return now;
+        },
+        pauseWhenHidden: function() {
+            var hidden = document.hidden;
+            return [hidden, hidden, hidden, hidden];
+        },
+        renderExchanges: function(exchanges) {
+            return renderPanel(exchanges, 'No exchanges configured', function(exchange) {
+                if (exchange.error) {
+                    return el('Div', 'exchange-card', [
+                        el('Div', 'exchange-header', [
+                            el('Div', 'exchange-name', exchange.name),
+                            el('Div', 'exchange-status error', exchange.status)
+                        ]),
+                        el('Div', 'exchange-balance', '$0.00'),
+                        el('Div', null, exchange.error, {fontSize: '11px', color: '#ff5252'})
+                    ]);
+                }
+                var assets = exchange.assets.map(function(asset) {
+                    return el('Div', 'asset-item', [
+                        el('Span', 'asset-name', asset[0]),
+                        el('Span', 'asset-amount', asset[1].toFixed(8))
+                    ]);
+                });
+                return el('Div', 'exchange-card', [
+                    el('Div', 'exchange-header', [
+                        el('Div', 'exchange-name', exchange.name),
+                        el('Div', 'exchange-status connected', '✅ Connected')
+                    ]),
+                    el('Div', 'exchange-balance', '$' + exchange.usd.toFixed(2)),
+                    el('Div', 'asset-list', assets.length ? assets : el('Div', null, 'No assets', {color: '#666', fontSize: '12px'}))
+                ]);
+            });
+        },
+        renderAgents: function(decisions) {
+            return renderPanel(decisions, 'No agent decisions yet. Agents are initializing...', function(decision) {
+                var confidence = decision.confidence ? (decision.confidence * 100).toFixed(1) + '%' : 'N/A';
+                return el('Div', 'agent-card ' + agentType(decision.agent), [
+                    el('Div', 'agent-header', [
+                        el('Div', 'agent-name', decision.agent),
+                        el('Div', 'agent-timestamp', decision.ts)
+                    ]),
+                    el('Div', 'agent-decision', decision.decision || 'Analyzing...'),
+                    el('Div', 'agent-reasoning', decision.reasoning || 'No detailed reasoning available'),
+                    el('Div', 'agent-footer', [
+                        el('Span', 'agent-confidence', 'Confidence: ' + confidence),
+                        el('Span', 'agent-status ' + (decision.executed ? 'executed' : ''),
+                           'Status: ' + (decision.executed ? 'Executed' : 'Pending'))
+                    ])
+                ]);
+            });
+        },
+        renderChat: function(chat) {
+            if (!chat) {
+                return window.dash_clientside.no_update;
+            }
+            if (!chat.messages.length) {
+                return el('Div', null, [
+                    el('Div', null, "👋 Welcome! I'm your GPT-5 AI trading assistant with function calling.",
+                       {color: '#00ff88', fontWeight: 'bold', marginBottom: '10px'}),
+                    el('Div', null, 'Ask me about your portfolio, agent decisions, trading performance, or market analysis. I can query the database in real-time!',
+                       {color: '#aaa'})
+                ], {textAlign: 'center', padding: '40px 20px'});
+            }
+            // Keyed by history index, so React keeps existing messages and only new ones
+            // mount (and play the slideIn animation)
+            return el('Div', null, chat.messages.map(function(message, i) {
+                var assistant = message[0] === 'assistant';
+                var node = el('Div', 'chat-message ' + (assistant ? 'assistant' : 'user'), [
+                    el('Div', 'chat-message-header', assistant ? '🤖 GPT-5 ASSISTANT' : '👤 YOU'),
+                    el('Div', 'chat-message-content', message[1])
+                ]);
+                node.props.key = 'chat-' + (chat.first + i);
+                return node;
+            }));
+        },
+        renderTrades: function(trades) {
+            return renderPanel(trades, 'No trades yet. System is monitoring markets...', function(trade) {
+                var side = trade.side === 'buy' ? 'buy' : 'sell';
+                return el('Div', 'trade-item ' + side, [
+                    el('Div', 'trade-header', [
+                        el('Div', 'trade-symbol', trade.symbol),
+                        el('Div', 'trade-side ' + side, trade.side.toUpperCase())
+                    ]),
+                    el('Div', 'trade-details', [
+                        el('Span', null, 'Qty: ' + trade.quantity.toFixed(8)),
+                        el('Span', null, 'Price: $' + trade.price.toFixed(2)),
+                        el('Span', null, tradeTime(trade.epoch))
+                    ])
+                ]);
+            });
+        }
+    }
+});
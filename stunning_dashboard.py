@@ -5,19 +5,75 @@ With REAL exchange data, GPT-5 integration with function calling, and detailed a
 """
 
 import dash
-from dash import dcc, html, Input, Output, State, no_update
+from dash import dcc, html, Input, Output, State, Patch, ClientsideFunction, no_update
+from dash.exceptions import PreventUpdate
+from flask import Response, request
 import dash_auth
 import plotly.graph_objs as go
 import ccxt
+import ccxt.pro as ccxtpro
+import asyncio
+import atexit
 import json
+import gzip
+import hashlib
+import logging
 import os
 import time
 from datetime import datetime, timedelta
 import threading
+import select
+import queue
+from collections import OrderedDict, deque, namedtuple
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from psycopg2.errors import UndefinedTable
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+from contextlib import contextmanager
 from openai import OpenAI
+import httpx
+import importlib.util
+
+# orjson is several times faster and encodes datetimes natively; fall back to the stdlib if it's missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Per-tick detail is logged at DEBUG, so it costs nothing unless asked for
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class RateLimitFilter(logging.Filter):
+    """Drop repeats of the same error within `interval` seconds, so a failure storm (every
+    client's callbacks failing each tick while the DB is down) logs one traceback per error"""
+    def __init__(self, interval=60):
+        super().__init__()
+        self.interval = interval
+        self.last_logged = {}
+        self.lock = threading.Lock()
+    
+    def filter(self, record):
+        if record.levelno < logging.ERROR:
+            return True
+        exc = record.exc_info[1] if record.exc_info else None
+        key = (record.msg, type(exc), str(exc))
+        now = time.monotonic()
+        with self.lock:
+            if now - self.last_logged.get(key, -self.interval) < self.interval:
+                return False
+            if len(self.last_logged) > 1000:
+                self.last_logged.clear()
+            self.last_logged[key] = now
+        return True
+
+ERROR_LOG_INTERVAL = 60  # seconds an identical error stays muted after being logged
+logger.addFilter(RateLimitFilter(ERROR_LOG_INTERVAL))
 
 # AUTHENTICATION
 VALID_USERNAME_PASSWORD_PAIRS = {
@@ -37,12 +93,190 @@ except ImportError:
     with open(get_config_path(), 'r') as f:
         config = json.load(f)
 
-# Initialize OpenAI client for GPT-5
-openai_client = OpenAI(api_key=config.get('openai_api_key'))
+# Initialize OpenAI client for GPT-5, on one keep-alive pool sized for concurrent chats.
+# HTTP/2 needs the optional h2 package, so it is only turned on when that is installed
+openai_http_client = httpx.Client(
+    http2=importlib.util.find_spec('h2') is not None,
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    timeout=30.0
+)
+openai_client = OpenAI(api_key=config.get('openai_api_key'), http_client=openai_http_client)
+atexit.register(openai_http_client.close)
+
+# Hot dashboard queries, prepared once per pooled connection and then run with EXECUTE
+DASHBOARD_QUERIES = {
+    'agent_decisions_q': """
+        SELECT
+            id,
+            agent as agent_name,
+            decision,
+            reasoning,
+            confidence,
+            timestamp,
+            executed
+        FROM agent_decisions
+        ORDER BY timestamp DESC
+        LIMIT 20
+    """,
+    'agent_logs_q': """
+        SELECT
+            id,
+            agent_name,
+            log_level,
+            message,
+            timestamp,
+            metadata
+        FROM agent_logs
+        WHERE log_level IN ('INFO', 'WARNING', 'ERROR')
+        ORDER BY timestamp DESC
+        LIMIT 30
+    """,
+    'trades_q': """
+        SELECT
+            symbol,
+            side,
+            quantity,
+            price,
+            -- Seconds since the epoch; the browser formats it (renderTrades)
+            EXTRACT(EPOCH FROM timestamp)::float8 AS epoch
+        FROM trades
+        ORDER BY timestamp DESC
+        LIMIT 10
+    """,
+    # Cumulative P&L series, kept up to date by the trades insert trigger (init_db.py)
+    'portfolio_history_q': """
+        SELECT timestamp, cumulative_pnl
+        FROM portfolio_pnl
+        ORDER BY timestamp DESC
+        LIMIT 50
+    """,
+    # Same series computed from trades, for databases initialized before portfolio_pnl existed
+    'trade_history_q': """
+        SELECT timestamp, SUM(pnl) OVER (ORDER BY timestamp) as cumulative_pnl
+        FROM trades
+        ORDER BY timestamp DESC
+        LIMIT 50
+    """,
+    # Orchestrator activity: active agents (5 min), decisions (1 min), risk checks and trades (5 min)
+    'orchestrator_counts_q': """
+        SELECT
+            d.active_agents,
+            d.recent_decisions,
+            (SELECT COUNT(*) FROM risk_metrics WHERE timestamp > NOW() - INTERVAL '5 minutes'),
+            (SELECT COUNT(*) FROM trades WHERE executed_at > NOW() - INTERVAL '5 minutes')
+        FROM (
+            -- Both agent_decisions counts come from a single scan of the last 5 minutes
+            SELECT
+                COUNT(DISTINCT agent) as active_agents,
+                COUNT(*) FILTER (WHERE timestamp > NOW() - INTERVAL '1 minute') as recent_decisions
+            FROM agent_decisions
+            WHERE timestamp > NOW() - INTERVAL '5 minutes'
+        ) d
+    """,
+    # Chat tool payloads, built as JSON text by Postgres and handed to the model as-is
+    'agent_activities_json_q': """
+        SELECT json_build_object('decisions', COALESCE(json_agg(d ORDER BY d.timestamp DESC), '[]'::json))::text
+        FROM (
+            SELECT
+                agent as agent_name,
+                decision,
+                reasoning,
+                COALESCE(confidence, 0)::float as confidence,
+                timestamp,
+                executed
+            FROM agent_decisions
+            ORDER BY timestamp DESC
+            LIMIT 10
+        ) d
+    """,
+    'recent_trades_json_q': """
+        SELECT json_build_object('trades', COALESCE(json_agg(t ORDER BY t.timestamp DESC), '[]'::json))::text
+        FROM (
+            SELECT
+                symbol,
+                side,
+                COALESCE(quantity, 0)::float as quantity,
+                COALESCE(price, 0)::float as price,
+                timestamp,
+                exchange,
+                status,
+                COALESCE(pnl, 0)::float as pnl
+            FROM trades
+            ORDER BY timestamp DESC
+            LIMIT 10
+        ) t
+    """
+}
+
+# Row shapes for DASHBOARD_QUERIES; plain tuple cursors plus namedtuples avoid a dict per row
+AgentDecision = namedtuple('AgentDecision', 'id agent_name decision reasoning confidence timestamp executed')
+AgentLog = namedtuple('AgentLog', 'id agent_name log_level message timestamp metadata')
+Trade = namedtuple('Trade', 'symbol side quantity price epoch')
+DASHBOARD_ROW_TYPES = {
+    'agent_decisions_q': AgentDecision,
+    'agent_logs_q': AgentLog,
+    'trades_q': Trade
+}
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """Connection that remembers which DASHBOARD_QUERIES it has already prepared"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+def execute_prepared(cursor, name):
+    """Run a DASHBOARD_QUERIES statement, preparing it on first use by this connection"""
+    conn = cursor.connection
+    if name not in conn.prepared:
+        cursor.execute(f"PREPARE {name} AS {DASHBOARD_QUERIES[name]}")
+        conn.prepared.add(name)
+    cursor.execute(f"EXECUTE {name}")
 
-# Database connection
+def fetch_prepared(cursor, name):
+    """Run a DASHBOARD_QUERIES statement and return its rows as namedtuples"""
+    execute_prepared(cursor, name)
+    return list(map(DASHBOARD_ROW_TYPES[name]._make, cursor.fetchall()))
+
+# Database connection pool (created on first use so the app still starts without a DB).
+# Connections stay open instead of being opened and closed under load. ThreadedConnectionPool
+# raises as soon as all DB_POOL_SIZE are out, so checkouts are counted by a semaphore and
+# callers (IO_POOL workers, Dash callbacks, chat, SSE) wait up to DB_CHECKOUT_TIMEOUT instead
+DB_POOL_MIN = 2
+DB_POOL_SIZE = 16
+DB_CHECKOUT_TIMEOUT = 10
+db_pool = None
+db_pool_lock = threading.Lock()
+db_checkouts = threading.BoundedSemaphore(DB_POOL_SIZE)
+
+def get_db_pool():
+    global db_pool
+    with db_pool_lock:
+        if db_pool is None:
+            db_pool = ThreadedConnectionPool(
+                DB_POOL_MIN, DB_POOL_SIZE,
+                **config['database'],
+                connection_factory=PreparingConnection
+            )
+        return db_pool
+
+@contextmanager
 def get_db_connection():
-    return psycopg2.connect(**config['database'], cursor_factory=RealDictCursor)
+    """Borrow a pooled connection, waiting for one if all are in use, and hand it back afterwards"""
+    pool = get_db_pool()
+    if not db_checkouts.acquire(timeout=DB_CHECKOUT_TIMEOUT):
+        raise PoolError(f"no database connection free within {DB_CHECKOUT_TIMEOUT}s")
+    try:
+        conn = pool.getconn()
+        if conn.closed:
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+        try:
+            conn.autocommit = True  # read-only queries; a failure must not abort later ones
+            yield conn
+        finally:
+            pool.putconn(conn, close=bool(conn.closed))
+    finally:
+        db_checkouts.release()
 
 # Initialize exchanges
 exchanges = {}
@@ -82,35 +316,75 @@ if config.get('kraken_api_key') and config.get('kraken_api_secret'):
         exchange_status['kraken'] = f'Error: {str(e)}'
 
 # Cache and state
-cache = {}
-cache_lock = threading.Lock()
-chat_history = []
+# Bounded LRU of fresh fetches; expired entries are dropped on lookup. last_known keeps the
+# latest good value per key (also bounded) so stale data survives TTL expiry for error fallback
+CACHE_MAX_ENTRIES = 256
+cache = OrderedDict()
+last_known = OrderedDict()
+cache_lock = threading.Lock()  # guards cache, last_known and key_locks, never held across a fetch
+key_locks = {}
+CHAT_HISTORY_MAX = 200
+chat_history = deque(maxlen=CHAT_HISTORY_MAX)  # oldest messages fall off
+chat_version = 0  # messages ever added to chat_history; doubles as its change counter
 chat_lock = threading.Lock()
+CHAT_DISPLAY_MESSAGES = 10
 
 STARTING_CAPITAL = 60.00
+STABLES = frozenset({'USD', 'USDT', 'USDC', 'DAI', 'BUSD'})
+DUST_AMOUNT = 0.0001
+
+# Shared pool for the independent exchange/DB/price fetches behind each refresh
+IO_POOL = ThreadPoolExecutor(max_workers=8)
+IO_TIMEOUT = 10
+
+def lru_put(store, key, value):
+    """Insert into a bounded LRU store, returning the evicted key if any"""
+    store[key] = value
+    store.move_to_end(key)
+    if len(store) > CACHE_MAX_ENTRIES:
+        return store.popitem(last=False)[0]
+    return None
 
 def get_cached_or_fetch(key, fetch_func, ttl=30):
-    """Get cached data or fetch new"""
+    """Get cached data or fetch new; only one thread refetches a given key"""
     with cache_lock:
-        now = time.time()
-        if key in cache:
-            data, timestamp, error = cache[key]
-            if now - timestamp < ttl:
-                return data, error
-        
+        entry = cache.get(key)
+        if entry:
+            if time.time() - entry[1] < ttl:
+                cache.move_to_end(key)
+                return entry[0], entry[2]
+            del cache[key]
+        has_stale = key in last_known
+        stale = last_known.get(key, {})
+        key_lock = key_locks.setdefault(key, threading.Lock())
+    
+    if not key_lock.acquire(blocking=False):
+        # Another thread is already refetching this key
+        if has_stale:
+            return stale, None
+        # Nothing cached yet, so wait for that fetch instead of duplicating it
+        with key_lock:
+            with cache_lock:
+                data, _, error = cache.get(key, ({}, 0, None))
+            return data, error
+    
+    try:
         try:
             data = fetch_func()
-            cache[key] = (data, now, None)
+            with cache_lock:
+                lru_put(cache, key, (data, time.time(), None))
+                evicted = lru_put(last_known, key, data)
+                if evicted is not None and evicted != key:
+                    key_locks.pop(evicted, None)
             return data, None
         except Exception as e:
             error_msg = str(e)
-            print(f"Cache fetch error for {key}: {error_msg}")
-            if key in cache:
-                old_data, _, _ = cache[key]
-                cache[key] = (old_data, now, error_msg)
-                return old_data, error_msg
-            cache[key] = ({}, now, error_msg)
-            return {}, error_msg
+            logger.warning("Cache fetch error for %s: %s", key, error_msg)
+            with cache_lock:
+                lru_put(cache, key, (stale, time.time(), error_msg))
+            return stale, error_msg
+    finally:
+        key_lock.release()
 
 def fetch_real_balance(exchange_name):
     """Fetch REAL balance from exchange - NOT fake database data"""
@@ -120,10 +394,69 @@ def fetch_real_balance(exchange_name):
     balance = exchanges[exchange_name].fetch_balance()
     return balance.get('total', {})
 
+# Keep-alive session for the REST price fallback, so it does not pay a TLS handshake per call
+http_session = requests.Session()
+http_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+))
+
+# Live prices streamed from Kraken's public ticker WebSocket, keyed by asset
+PRICE_STREAM_SYMBOLS = {'BTC/USD': 'BTC', 'ETH/USD': 'ETH', 'SOL/USD': 'SOL'}
+PRICE_STREAM_STALE = 10  # seconds without a message before falling back to REST
+PRICE_REST_TTL = 15  # seconds the REST fallback quotes are reused
+stream_prices = {}
+stream_last_message = 0.0
+price_stream_thread = None
+price_stream_lock = threading.Lock()
+
+async def stream_kraken_prices():
+    """Keep stream_prices current, reconnecting with exponential backoff"""
+    global stream_last_message
+    exchange = ccxtpro.kraken({'enableRateLimit': True})
+    backoff = 1
+    try:
+        while True:
+            try:
+                tickers = await exchange.watch_tickers(list(PRICE_STREAM_SYMBOLS))
+            except Exception as e:
+                logger.error("Kraken price stream error: %s", e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 300)
+                continue
+            
+            backoff = 1
+            for symbol, ticker in tickers.items():
+                asset = PRICE_STREAM_SYMBOLS.get(symbol)
+                if asset and ticker.get('last'):
+                    stream_prices[asset] = float(ticker['last'])
+            stream_last_message = time.monotonic()
+    finally:
+        await exchange.close()
+
+def ensure_price_stream():
+    """Start the price stream thread on first use in this process"""
+    global price_stream_thread
+    with price_stream_lock:
+        if price_stream_thread is None:
+            price_stream_thread = threading.Thread(target=lambda: asyncio.run(stream_kraken_prices()), daemon=True)
+            price_stream_thread.start()
+
 def get_crypto_prices():
+    """Current crypto prices from the stream, or from REST while it is down"""
+    ensure_price_stream()
+    prices = dict(stream_prices)
+    if len(prices) == len(PRICE_STREAM_SYMBOLS) and time.monotonic() - stream_last_message < PRICE_STREAM_STALE:
+        return prices
+    # Shared by every callback and chat tool, so an outage costs one REST call per window
+    prices, _ = get_cached_or_fetch('rest_prices', fetch_rest_prices, PRICE_REST_TTL)
+    return prices
+
+def fetch_rest_prices():
     """Fetch current crypto prices"""
     try:
-        response = requests.get('https://api.kraken.com/0/public/Ticker?pair=XBTUSD,ETHUSD,SOLUSD', timeout=5)
+        response = http_session.get('https://api.kraken.com/0/public/Ticker?pair=XBTUSD,ETHUSD,SOLUSD', timeout=5)
         data = response.json()
         if data.get('error') and len(data['error']) > 0:
             return {'BTC': 111220, 'ETH': 3971, 'SOL': 190}
@@ -134,145 +467,259 @@ def get_crypto_prices():
         sol_price = float(result.get('SOLUSD', {}).get('c', [190])[0])
         return {'BTC': btc_price, 'ETH': eth_price, 'SOL': sol_price}
     except Exception as e:
-        print(f"Error fetching prices: {e}")
+        logger.error("Error fetching prices: %s", e)
         return {'BTC': 111220, 'ETH': 3971, 'SOL': 190}
 
+# Agent decisions/logs arrive via LISTEN/NOTIFY (triggers in init_db.py) into in-memory
+# feeds, so the panels read a deque instead of re-querying both tables every refresh
+AGENT_FEED_CHANNELS = {
+    'agent_decisions': ('agent_decisions_q', 20),
+    'agent_logs': ('agent_logs_q', 30)
+}
+AGENT_LOG_LEVELS = frozenset({'INFO', 'WARNING', 'ERROR'})
+agent_feed = {channel: deque(maxlen=size) for channel, (_, size) in AGENT_FEED_CHANNELS.items()}
+agent_feed_lock = threading.Lock()
+agent_feed_ready = threading.Event()
+agent_feed_thread = None
+FEED_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'  # notify_agent_row's to_char format
+
+def load_agent_feed(conn, channel):
+    """Replace a feed with the latest rows from its table"""
+    query = AGENT_FEED_CHANNELS[channel][0]
+    with conn.cursor() as cur:
+        cur.execute(DASHBOARD_QUERIES[query])
+        rows = list(map(DASHBOARD_ROW_TYPES[query]._make, cur.fetchall()))
+    with agent_feed_lock:
+        agent_feed[channel].clear()
+        agent_feed[channel].extend(rows)
+
+def feed_row(channel, row):
+    """Shape a NOTIFY payload like the matching DASHBOARD_QUERIES row, or None if the panel skips it"""
+    row['timestamp'] = datetime.strptime(row['timestamp'], FEED_TIMESTAMP_FORMAT) if row['timestamp'] else None
+    if channel == 'agent_decisions':
+        row['agent_name'] = row.get('agent')
+        return AgentDecision._make(row.get(field) for field in AgentDecision._fields)
+    if row.get('log_level') not in AGENT_LOG_LEVELS:
+        return None
+    return AgentLog._make(row.get(field) for field in AgentLog._fields)
+
+def listen_for_agent_rows():
+    """Hold one LISTEN connection and apply each notified row to its feed, reconnecting on failure"""
+    backoff = 1
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(**config['database'])
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                for channel in AGENT_FEED_CHANNELS:
+                    cur.execute(f"LISTEN {channel}")
+            # Load after LISTEN so no insert falls between the two; overlaps are dropped by id below
+            for channel in AGENT_FEED_CHANNELS:
+                load_agent_feed(conn, channel)
+            agent_feed_ready.set()
+            backoff = 1
+            
+            while True:
+                if select.select([conn], [], [], 60) == ([], [], []):
+                    continue
+                conn.poll()
+                changed = False
+                for notify in conn.notifies:
+                    try:
+                        row = json.loads(notify.payload)
+                        shaped = feed_row(notify.channel, row) if 'timestamp' in row else None
+                    except (ValueError, TypeError, KeyError) as e:
+                        # One unreadable payload (e.g. from an older trigger) must not drop the
+                        # listener; re-read the table instead
+                        logger.warning("Bad %s notification, reloading feed: %s", notify.channel, e)
+                        row = {}
+                    if 'timestamp' not in row:
+                        # Payload only carries the id (too large for NOTIFY) or could not be read
+                        load_agent_feed(conn, notify.channel)
+                        changed = True
+                        continue
+                    if shaped is None:
+                        continue
+                    with agent_feed_lock:
+                        feed = agent_feed[notify.channel]
+                        if all(existing.id != shaped.id for existing in feed):
+                            feed.appendleft(shaped)
+                            changed = True
+                conn.notifies.clear()
+                if changed:
+                    announce_update()
+        except Exception as e:
+            agent_feed_ready.clear()
+            logger.error("Agent feed listener error: %s", e)
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+        finally:
+            if conn is not None:
+                conn.close()
+
+def ensure_agent_feed():
+    """Start the agent feed listener on first use in this process"""
+    global agent_feed_thread
+    with agent_feed_lock:
+        if agent_feed_thread is None:
+            agent_feed_thread = threading.Thread(target=listen_for_agent_rows, daemon=True)
+            agent_feed_thread.start()
+
+def read_agent_feed(channel):
+    """Current rows of a feed, newest first, or None while the listener is not connected"""
+    ensure_agent_feed()
+    if not agent_feed_ready.is_set():
+        return None
+    with agent_feed_lock:
+        return list(agent_feed[channel])
+
 def get_agent_decisions_from_db():
     """Get REAL agent decisions from database"""
+    decisions = read_agent_feed('agent_decisions')
+    if decisions is not None:
+        return decisions
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        # Get recent agent decisions with detailed reasoning
-        cur.execute("""
-            SELECT 
-                agent as agent_name,
-                decision,
-                reasoning,
-                confidence,
-                timestamp,
-                executed
-            FROM agent_decisions 
-            ORDER BY timestamp DESC 
-            LIMIT 20
-        """)
-        decisions = cur.fetchall()
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                decisions = fetch_prepared(cur, 'agent_decisions_q')
         
-        cur.close()
-        conn.close()
-        
-        print(f"Fetched {len(decisions)} agent decisions from database")
+        logger.debug("Fetched %d agent decisions from database", len(decisions))
         return decisions
-    except Exception as e:
-        print(f"Error fetching agent decisions: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error fetching agent decisions")
         return []
 
 def get_agent_logs_from_db():
     """Get REAL agent logs from database"""
+    logs = read_agent_feed('agent_logs')
+    if logs is not None:
+        return logs
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                agent_name,
-                log_level,
-                message,
-                timestamp,
-                metadata
-            FROM agent_logs 
-            WHERE log_level IN ('INFO', 'WARNING', 'ERROR')
-            ORDER BY timestamp DESC 
-            LIMIT 30
-        """)
-        logs = cur.fetchall()
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                logs = fetch_prepared(cur, 'agent_logs_q')
         
-        cur.close()
-        conn.close()
-        
-        print(f"Fetched {len(logs)} agent logs from database")
+        logger.debug("Fetched %d agent logs from database", len(logs))
         return logs
-    except Exception as e:
-        print(f"Error fetching agent logs: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error fetching agent logs")
         return []
 
 def get_recent_trades_from_db():
     """Get recent trades from database"""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                symbol,
-                side,
-                quantity,
-                price,
-                timestamp,
-                exchange,
-                status,
-                pnl
-            FROM trades 
-            ORDER BY timestamp DESC 
-            LIMIT 15
-        """)
-        trades = cur.fetchall()
-        
-        cur.close()
-        conn.close()
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                trades = fetch_prepared(cur, 'trades_q')
         
-        print(f"Fetched {len(trades)} trades from database")
+        logger.debug("Fetched %d trades from database", len(trades))
         return trades
+    except Exception:
+        logger.exception("Error fetching trades")
+        return []
+
+def get_orchestrator_counts_from_db():
+    """Active agents, recent decisions, risk checks and recent trades, in one round trip"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            execute_prepared(cur, 'orchestrator_counts_q')
+            return cur.fetchone()
+
+# Panel reads shared by every open page for a second or two, so N browsers polling the
+# same panel cost one query; announce_update() drops them as soon as the data changes
+PANEL_CACHE_TTL = {
+    'orchestrator_counts': 1,
+    'recent_trades': 2
+}
+
+def get_panel_data(key, fetch_func):
+    """Cached panel read, as (data, error) like get_cached_or_fetch"""
+    return get_cached_or_fetch(key, fetch_func, PANEL_CACHE_TTL[key])
+
+def value_balance(balance, prices):
+    """USD value of a balance and the (asset, amount) pairs it counted.
+    Dust and assets without a price (e.g. EUR.HOLD) are skipped."""
+    total = 0.0
+    held = []
+    for asset, amount in balance.items():
+        if amount <= DUST_AMOUNT:
+            continue
+        price = 1.0 if asset in STABLES else prices.get(asset)
+        if price is None:
+            continue
+        total += amount * price
+        held.append((asset, amount))
+    return total, held
+
+def get_open_positions_from_db():
+    """Count open positions in the database"""
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT COUNT(*) as count FROM trades WHERE status = 'open'")
+                open_pos = cur.fetchone()[0]
+        logger.debug("Open positions: %s", open_pos)
+        return open_pos
     except Exception as e:
-        print(f"Error fetching trades: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Error fetching open positions: %s", e)
+        return 0
+
+def get_trade_history_from_db():
+    """Get cumulative P&L history, newest first"""
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cur:
+                try:
+                    execute_prepared(cur, 'portfolio_history_q')
+                except UndefinedTable:
+                    execute_prepared(cur, 'trade_history_q')
+                trade_history = cur.fetchall()
+        logger.debug("Trade history records: %d", len(trade_history))
+        return trade_history
+    except Exception as e:
+        logger.error("Error fetching trade history: %s", e)
         return []
 
+# Display name and error card (status, detail; None shows the raw error) per exchange
+EXCHANGE_DISPLAY = {
+    'kraken': ('Kraken', '⚠️ API Error', None),
+    'binance': ('Binance', '🚫 Geo-blocked', 'Unable to access from this region')
+}
+
+def fetch_balances_concurrently():
+    """Start the price and all exchange balance fetches at once"""
+    prices_future = IO_POOL.submit(get_crypto_prices)
+    balance_futures = {
+        name: IO_POOL.submit(get_cached_or_fetch, f'{name}_balance', lambda name=name: fetch_real_balance(name), 60)
+        for name in EXCHANGE_DISPLAY
+    }
+    return prices_future, balance_futures
+
+def gather_results(futures, timeout=IO_TIMEOUT):
+    """Results of futures started together, under one shared deadline rather than a timeout each"""
+    _, pending = wait(futures, timeout=timeout)
+    if pending:
+        raise TimeoutError(f"{len(pending)} fetch(es) still running after {timeout}s")
+    return [future.result() for future in futures]
+
 # GPT-5 Function Definitions
 def get_portfolio_metrics():
     """Get current portfolio balance and P&L"""
     try:
-        prices = get_crypto_prices()
+        prices_future, balance_futures = fetch_balances_concurrently()
+        prices, *balance_results = gather_results([prices_future, *balance_futures.values()])
         
         total_usd = 0
         balances = {}
         
-        # Kraken balance
-        kraken_balance, kraken_error = get_cached_or_fetch('kraken_balance', lambda: fetch_real_balance('kraken'), ttl=30)
-        if not kraken_error:
-            kraken_usd = 0
-            for asset, amount in kraken_balance.items():
-                if amount > 0.0001:
-                    if asset in ['USD', 'USDT', 'USDC', 'DAI', 'BUSD']:
-                        asset_value = amount
-                    elif asset in prices:
-                        asset_value = amount * prices[asset]
-                    else:
-                        continue
-                    kraken_usd += asset_value
-                    balances[f'Kraken_{asset}'] = amount
-            total_usd += kraken_usd
-        
-        # Binance balance
-        binance_balance, binance_error = get_cached_or_fetch('binance_balance', lambda: fetch_real_balance('binance'), ttl=30)
-        if not binance_error:
-            binance_usd = 0
-            for asset, amount in binance_balance.items():
-                if amount > 0.0001:
-                    if asset in ['USD', 'USDT', 'USDC', 'DAI', 'BUSD']:
-                        asset_value = amount
-                    elif asset in prices:
-                        asset_value = amount * prices[asset]
-                    else:
-                        continue
-                    binance_usd += asset_value
-                    balances[f'Binance_{asset}'] = amount
-            total_usd += binance_usd
+        for name, (balance, error) in zip(balance_futures, balance_results):
+            if error:
+                continue
+            exchange_usd, held = value_balance(balance, prices)
+            label = EXCHANGE_DISPLAY[name][0]
+            balances.update((f'{label}_{asset}', amount) for asset, amount in held)
+            total_usd += exchange_usd
         
         pnl = total_usd - STARTING_CAPITAL
         pnl_pct = (pnl / STARTING_CAPITAL) * 100
@@ -288,45 +735,24 @@ def get_portfolio_metrics():
     except Exception as e:
         return {'error': str(e)}
 
+def fetch_json_payload(name):
+    """Run one of the *_json_q statements and return its JSON text"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            execute_prepared(cur, name)
+            return cur.fetchone()[0]
+
 def get_recent_trades():
-    """Get recent trading activity"""
+    """Get recent trading activity (JSON text)"""
     try:
-        trades = get_recent_trades_from_db()
-        return {
-            'trades': [
-                {
-                    'symbol': t['symbol'],
-                    'side': t['side'],
-                    'quantity': float(t['quantity']) if t['quantity'] else 0,
-                    'price': float(t['price']) if t['price'] else 0,
-                    'timestamp': t['timestamp'].isoformat() if t['timestamp'] else None,
-                    'exchange': t['exchange'],
-                    'status': t['status'],
-                    'pnl': float(t['pnl']) if t['pnl'] else 0
-                }
-                for t in trades[:10]
-            ]
-        }
+        return fetch_json_payload('recent_trades_json_q')
     except Exception as e:
         return {'error': str(e)}
 
 def get_agent_activities():
-    """Get what agents are doing and their reasoning"""
+    """Get what agents are doing and their reasoning (JSON text)"""
     try:
-        decisions = get_agent_decisions_from_db()
-        return {
-            'decisions': [
-                {
-                    'agent_name': d['agent_name'],
-                    'decision': d['decision'],
-                    'reasoning': d['reasoning'],
-                    'confidence': float(d['confidence']) if d['confidence'] else 0,
-                    'timestamp': d['timestamp'].isoformat() if d['timestamp'] else None,
-                    'executed': d['executed']
-                }
-                for d in decisions[:10]
-            ]
-        }
+        return fetch_json_payload('agent_activities_json_q')
     except Exception as e:
         return {'error': str(e)}
 
@@ -336,7 +762,7 @@ def get_market_data():
         prices = get_crypto_prices()
         return {
             'prices': prices,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now()
         }
     except Exception as e:
         return {'error': str(e)}
@@ -401,11 +827,51 @@ available_functions = {
     "get_market_data": get_market_data
 }
 
-def chat_with_gpt5(user_message, conversation_history):
-    """Chat with GPT-5 using OpenAI API with function calling"""
-    try:
-        # Prepare messages
-        system_prompt = """You are an expert cryptocurrency trading assistant with full access to the trading system's database through function calls.
+# Tool results are reused within a TTL bucket, so repeated calls in one chat don't re-hit DB/exchanges
+TOOL_CACHE_TTL = 15
+TOOL_CACHE_SIZE = 64
+tool_cache = OrderedDict()
+tool_cache_lock = threading.Lock()
+
+def dumps_tool_response(response):
+    """Serialize a tool result for the model; datetimes become ISO strings"""
+    if orjson:
+        return orjson.dumps(response).decode()
+    return json.dumps(response, default=lambda value: value.isoformat())
+
+def call_tool(function_name, function_args):
+    """Run a chat tool and return its JSON result, cached per (name, args, TTL bucket)"""
+    cache_key = (function_name, json.dumps(function_args, sort_keys=True), int(time.time()) // TOOL_CACHE_TTL)
+    with tool_cache_lock:
+        if cache_key in tool_cache:
+            tool_cache.move_to_end(cache_key)
+            return tool_cache[cache_key]
+    
+    function_response = available_functions[function_name](**function_args)
+    if isinstance(function_response, str):
+        # Already serialized by Postgres
+        content, cacheable = function_response, True
+    else:
+        content, cacheable = dumps_tool_response(function_response), 'error' not in function_response
+    if cacheable:
+        with tool_cache_lock:
+            tool_cache[cache_key] = content
+            while len(tool_cache) > TOOL_CACHE_SIZE:
+                tool_cache.popitem(last=False)
+    return content
+
+# Tools run on their own pool: get_portfolio_metrics waits on IO_POOL work, so running
+# tools on IO_POOL too could leave every worker blocked on work queued behind it
+TOOL_POOL = ThreadPoolExecutor(max_workers=4)
+
+def run_tool_call(tool_call):
+    """Decode one model tool call and return its JSON result"""
+    function_name = tool_call.function.name
+    function_args = orjson.loads(tool_call.function.arguments) if orjson else json.loads(tool_call.function.arguments)
+    logger.debug("GPT-5 calling function: %s with args: %r", function_name, function_args)
+    return call_tool(function_name, function_args)
+
+SYSTEM_PROMPT = """You are an expert cryptocurrency trading assistant with full access to the trading system's database through function calls.
 
 You can analyze:
 - Portfolio performance and P&L (use get_portfolio_metrics)
@@ -415,18 +881,19 @@ You can analyze:
 
 Always use the appropriate function to get real-time data before answering questions. Provide insightful, data-driven analysis. Be professional, concise, and focus on actionable insights."""
 
-        messages = [{"role": "system", "content": system_prompt}]
-        
-        for msg in conversation_history:
-            messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
-        
-        messages.append({
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Only the latest messages go to the model, so prompt size (and latency) stays flat as a chat grows
+CHAT_CONTEXT_MESSAGES = 8
+
+def chat_with_gpt5(user_message, conversation_history):
+    """Chat with GPT-5 using OpenAI API with function calling"""
+    try:
+        # Prepare messages; history entries are already {"role", "content"} dicts and are shared, not copied
+        messages = [SYSTEM_MESSAGE, *conversation_history[-CHAT_CONTEXT_MESSAGES:], {
             "role": "user",
             "content": user_message
-        })
+        }]
         
         # Call GPT-5 API with function calling
         response = openai_client.chat.completions.create(
@@ -444,22 +911,14 @@ Always use the appropriate function to get real-time data before answering quest
         if tool_calls:
             messages.append(response_message)
             
-            # Execute each function call
-            for tool_call in tool_calls:
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
-                
-                print(f"GPT-5 calling function: {function_name} with args: {function_args}")
-                
-                # Call the function
-                function_response = available_functions[function_name](**function_args)
-                
+            # Execute the function calls in parallel (or reuse their recent results)
+            for tool_call, function_content in zip(tool_calls, TOOL_POOL.map(run_tool_call, tool_calls)):
                 # Add function response to messages
                 messages.append({
                     "tool_call_id": tool_call.id,
                     "role": "tool",
-                    "name": function_name,
-                    "content": json.dumps(function_response)
+                    "name": tool_call.function.name,
+                    "content": function_content
                 })
             
             # Get final response from GPT-5 after function calls
@@ -474,22 +933,164 @@ Always use the appropriate function to get real-time data before answering quest
             return response_message.content
         
     except Exception as e:
-        print(f"Error in chat_with_gpt5: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in chat_with_gpt5")
         return f"Error: {str(e)}"
 
 # Initialize Dash app
 external_stylesheets = [
     'https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;500;600;700&family=Inter:wght@300;400;500;600;700;800&display=swap'
 ]
-app = dash.Dash(__name__, suppress_callback_exceptions=True, external_stylesheets=external_stylesheets)
+# The only chart is a scatter trace, so the CDN-cached "basic" partial bundle is enough;
+# dcc.Graph uses the window.Plotly it defines instead of loading the full bundled plotly.js
+# (same plotly.js release as dash 2.14.2 ships)
+external_scripts = [
+    {'src': 'https://cdn.plot.ly/plotly-basic-2.27.0.min.js', 'crossorigin': 'anonymous'}
+]
+app = dash.Dash(__name__, suppress_callback_exceptions=True,
+                external_stylesheets=external_stylesheets, external_scripts=external_scripts)
 app.title = "🚀 Live Crypto Trading Dashboard"
 
 # Add authentication
 auth = dash_auth.BasicAuth(app, VALID_USERNAME_PASSWORD_PAIRS)
 
-# Professional CSS - Bloomberg Terminal inspired
+# Server push: new agent rows (via the NOTIFY listener) and trade changes (via one watcher per
+# process) are announced to every open page over SSE, so clients refresh on change instead of
+# each polling every table on a timer
+UPDATE_POLL_INTERVAL = 5
+SSE_KEEPALIVE = 15
+# Each open stream holds a server thread, so streams are closed after SSE_MAX_LIFETIME seconds and
+# the browser reconnects after SSE_RETRY_MS; the keep-alives also free threads of dropped clients
+SSE_MAX_LIFETIME = 300
+SSE_RETRY_MS = 2000
+update_version = 0
+update_condition = threading.Condition()
+update_watcher_thread = None
+
+def get_change_token_from_db():
+    """Cheap fingerprint of the trade data the dashboard panels read"""
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT
+                    (SELECT MAX(timestamp) FROM trades) as trades,
+                    (SELECT COUNT(*) FROM trades WHERE status = 'open') as open_trades
+            """)
+            return cur.fetchone()
+
+def announce_chat():
+    """Wake the SSE streams to send a chat event (chat_version has moved)"""
+    with update_condition:
+        update_condition.notify_all()
+
+def announce_update():
+    """Drop the cached panel reads, bump update_version and wake the SSE streams"""
+    global update_version
+    with cache_lock:
+        for key in PANEL_CACHE_TTL:
+            cache.pop(key, None)
+    with update_condition:
+        update_version += 1
+        update_condition.notify_all()
+
+def watch_for_updates():
+    """Announce an update whenever the change token moves"""
+    last_token = None
+    while True:
+        try:
+            token = get_change_token_from_db()
+            if token != last_token:
+                last_token = token
+                announce_update()
+        except Exception as e:
+            logger.error("Error watching for updates: %s", e)
+        time.sleep(UPDATE_POLL_INTERVAL)
+
+def ensure_update_watcher():
+    """Start the update watcher thread on first use in this process"""
+    global update_watcher_thread
+    with update_condition:
+        if update_watcher_thread is None:
+            update_watcher_thread = threading.Thread(target=watch_for_updates, daemon=True)
+            update_watcher_thread.start()
+
+def last_seen_versions():
+    """(update_version, chat_version) a reconnecting EventSource last saw, from its Last-Event-ID"""
+    try:
+        seen, chat_seen = map(int, request.headers.get('Last-Event-ID', '').split('-'))
+    except ValueError:
+        return update_version, chat_version
+    return seen, chat_seen
+
+# Needs a threaded server: the Flask server below is, and under gunicorn use the gthread
+# worker with enough threads for every open tab (see __main__)
+@app.server.route('/api/updates')
+def stream_updates():
+    """Server-sent events: one message per data change, a 'chat' event per chat change,
+    comments as keep-alives. Event ids carry both versions, so changes made while the
+    browser was reconnecting are sent as soon as it is back"""
+    ensure_update_watcher()
+    seen, chat_seen = last_seen_versions()
+    
+    def events():
+        nonlocal seen, chat_seen
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        deadline = time.monotonic() + SSE_MAX_LIFETIME
+        while time.monotonic() < deadline:
+            with update_condition:
+                update_condition.wait_for(
+                    lambda: update_version != seen or chat_version != chat_seen, timeout=SSE_KEEPALIVE
+                )
+                current, current_chat = update_version, chat_version
+            if current == seen and current_chat == chat_seen:
+                yield ": keep-alive\n\n"
+            event_id = f"{current}-{current_chat}"
+            if current != seen:
+                seen = current
+                yield f"id: {event_id}\ndata: {current}\n\n"
+            if current_chat != chat_seen:
+                chat_seen = current_chat
+                yield f"id: {event_id}\nevent: chat\ndata: {current_chat}\n\n"
+    
+    return Response(events(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# Professional CSS - Bloomberg Terminal inspired - and the page script are cacheable static files.
+# The content hash in each URL changes on every deploy that edits it, so a year-long max-age is safe
+app.server.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+
+def static_url(filename):
+    """URL of a file in the static folder, fingerprinted with its content hash"""
+    with open(os.path.join(app.server.static_folder, filename), 'rb') as f:
+        return f"/static/{filename}?v={hashlib.md5(f.read()).hexdigest()[:10]}"
+
+# Compress text responses (the index page, callback JSON, scripts and CSS) and let browsers keep
+# the fingerprinted bundles and assets forever; the index page itself is never cached
+GZIP_MIN_SIZE = 500
+GZIP_MIMETYPES = frozenset({'text/html', 'text/css', 'text/javascript', 'application/javascript', 'application/json'})
+IMMUTABLE_PREFIXES = ('/_dash-component-suites/', '/assets/', '/static/')
+
+@app.server.after_request
+def compress_and_cache(response):
+    if request.path.startswith(IMMUTABLE_PREFIXES):
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    elif response.mimetype == 'text/html':
+        response.headers['Cache-Control'] = 'no-store'
+    
+    # The SSE stream is text/event-stream, so the mimetype check also keeps it unbuffered
+    if (response.status_code != 200 or 'Content-Encoding' in response.headers
+            or response.mimetype not in GZIP_MIMETYPES or 'gzip' not in request.accept_encodings):
+        return response
+    response.direct_passthrough = False  # static files are sent as a file wrapper; read them in
+    body = response.get_data()
+    if len(body) < GZIP_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(body, 6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-gzip', weak)
+    return response
+
 app.index_string = '''
 <!DOCTYPE html>
 <html>
@@ -498,734 +1099,59 @@ app.index_string = '''
         <title>{%title%}</title>
         {%favicon%}
         {%css%}
-        <style>
-            @import url('https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;500;600;700&family=Inter:wght@300;400;500;600;700;800&display=swap');
-            
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            
-            body {
-                font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-                background: linear-gradient(135deg, #0a0e27 0%, #1a1f3a 50%, #0d1224 100%);
-                color: #e0e0e0;
-                overflow-x: hidden;
-            }
-            
-            .mono {
-                font-family: 'JetBrains Mono', monospace;
-            }
-            
-            /* Terminal Header */
-            .terminal-header {
-                background: linear-gradient(135deg, #1a1f3a 0%, #0d1224 100%);
-                border-bottom: 3px solid transparent;
-                border-image: linear-gradient(90deg, #00ff88, #00d4ff, #ff00ff) 1;
-                padding: 20px 40px;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                position: sticky;
-                top: 0;
-                z-index: 1000;
-                box-shadow: 0 8px 32px rgba(0, 0, 0, 0.7);
-                backdrop-filter: blur(10px);
-            }
-            
-            .terminal-title {
-                font-size: 24px;
-                font-weight: 800;
-                background: linear-gradient(135deg, #00ff88, #00d4ff);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                background-clip: text;
-                letter-spacing: 2px;
-                text-transform: uppercase;
-                text-shadow: 0 0 30px rgba(0, 255, 136, 0.5);
-            }
-            
-            .status-bar {
-                display: flex;
-                gap: 25px;
-                align-items: center;
-                font-size: 13px;
-                font-family: 'JetBrains Mono', monospace;
-            }
-            
-            .status-indicator {
-                display: flex;
-                align-items: center;
-                gap: 10px;
-                background: rgba(0, 0, 0, 0.3);
-                padding: 8px 15px;
-                border-radius: 20px;
-                border: 1px solid rgba(0, 255, 136, 0.3);
-            }
-            
-            .status-dot {
-                width: 10px;
-                height: 10px;
-                border-radius: 50%;
-                background: #00ff88;
-                box-shadow: 0 0 10px #00ff88, 0 0 20px #00ff88;
-                animation: pulse-dot 2s ease-in-out infinite;
-            }
-            
-            @keyframes pulse-dot {
-                0%, 100% { 
-                    opacity: 1; 
-                    transform: scale(1); 
-                    box-shadow: 0 0 10px #00ff88, 0 0 20px #00ff88;
-                }
-                50% { 
-                    opacity: 0.6; 
-                    transform: scale(1.3); 
-                    box-shadow: 0 0 20px #00ff88, 0 0 40px #00ff88;
-                }
-            }
-            
-            /* Grid System */
-            .terminal-grid {
-                display: grid;
-                grid-template-columns: repeat(12, 1fr);
-                gap: 20px;
-                padding: 25px;
-                max-width: 1920px;
-                margin: 0 auto;
-            }
-            
-            /* Terminal Panel */
-            .terminal-panel {
-                background: linear-gradient(135deg, rgba(26, 31, 58, 0.8) 0%, rgba(21, 25, 41, 0.9) 100%);
-                border: 1px solid #2d3748;
-                border-radius: 12px;
-                padding: 25px;
-                box-shadow: 0 8px 32px rgba(0, 0, 0, 0.4);
-                position: relative;
-                overflow: hidden;
-                backdrop-filter: blur(10px);
-                transition: all 0.3s ease;
-            }
-            
-            .terminal-panel::before {
-                content: '';
-                position: absolute;
-                top: 0;
-                left: 0;
-                right: 0;
-                height: 2px;
-                background: linear-gradient(90deg, transparent, #00ff88, #00d4ff, transparent);
-                opacity: 0.5;
-                animation: shimmer 3s linear infinite;
-            }
-            
-            @keyframes shimmer {
-                0% { transform: translateX(-100%); }
-                100% { transform: translateX(100%); }
-            }
-            
-            .terminal-panel:hover {
-                border-color: rgba(0, 255, 136, 0.5);
-                box-shadow: 0 12px 40px rgba(0, 255, 136, 0.2);
-                transform: translateY(-2px);
-            }
-            
-            .panel-header {
-                font-size: 15px;
-                font-weight: 700;
-                background: linear-gradient(135deg, #00ff88, #00d4ff);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                background-clip: text;
-                margin-bottom: 20px;
-                text-transform: uppercase;
-                letter-spacing: 1.5px;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                font-family: 'JetBrains Mono', monospace;
-            }
-            
-            .panel-badge {
-                background: linear-gradient(135deg, rgba(0, 255, 136, 0.2), rgba(0, 212, 255, 0.2));
-                color: #00ff88;
-                padding: 6px 14px;
-                border-radius: 20px;
-                font-size: 11px;
-                font-weight: 600;
-                border: 1px solid rgba(0, 255, 136, 0.3);
-                box-shadow: 0 0 15px rgba(0, 255, 136, 0.3);
-            }
-            
-            /* Metric Cards */
-            .metric-card {
-                background: linear-gradient(135deg, rgba(0, 0, 0, 0.4), rgba(0, 0, 0, 0.2));
-                border: 1px solid #2d3748;
-                border-radius: 12px;
-                padding: 20px;
-                transition: all 0.4s ease;
-                position: relative;
-                overflow: hidden;
-            }
-            
-            .metric-card::after {
-                content: '';
-                position: absolute;
-                top: -50%;
-                right: -50%;
-                width: 200%;
-                height: 200%;
-                background: radial-gradient(circle, rgba(0, 255, 136, 0.1) 0%, transparent 70%);
-                opacity: 0;
-                transition: opacity 0.4s ease;
-            }
-            
-            .metric-card:hover {
-                background: linear-gradient(135deg, rgba(0, 0, 0, 0.5), rgba(0, 255, 136, 0.05));
-                border-color: #00ff88;
-                transform: translateY(-5px) scale(1.02);
-                box-shadow: 0 10px 40px rgba(0, 255, 136, 0.3);
-            }
-            
-            .metric-card:hover::after {
-                opacity: 1;
-            }
-            
-            .metric-label {
-                font-size: 12px;
-                color: #888;
-                text-transform: uppercase;
-                letter-spacing: 1.5px;
-                margin-bottom: 10px;
-                font-weight: 600;
-                font-family: 'JetBrains Mono', monospace;
-            }
-            
-            .metric-value {
-                font-size: 32px;
-                font-weight: 800;
-                color: #fff;
-                font-family: 'JetBrains Mono', monospace;
-                text-shadow: 0 0 20px rgba(255, 255, 255, 0.3);
-            }
-            
-            .metric-value.positive {
-                color: #00ff88;
-                text-shadow: 0 0 20px rgba(0, 255, 136, 0.5);
-            }
-            
-            .metric-value.negative {
-                color: #ff5252;
-                text-shadow: 0 0 20px rgba(255, 82, 82, 0.5);
-            }
-            
-            .metric-change {
-                font-size: 14px;
-                margin-top: 8px;
-                font-family: 'JetBrains Mono', monospace;
-                font-weight: 600;
-            }
-            
-            /* Agent Cards */
-            .agent-card {
-                background: linear-gradient(135deg, rgba(0, 0, 0, 0.4), rgba(0, 0, 0, 0.2));
-                border-left: 4px solid #00ff88;
-                border-radius: 10px;
-                padding: 18px;
-                margin-bottom: 15px;
-                transition: all 0.4s ease;
-                position: relative;
-                overflow: hidden;
-            }
-            
-            .agent-card::before {
-                content: '';
-                position: absolute;
-                left: 0;
-                top: 0;
-                bottom: 0;
-                width: 4px;
-                background: linear-gradient(180deg, #00ff88, #00d4ff);
-                opacity: 0;
-                transition: opacity 0.4s ease;
-            }
-            
-            .agent-card:hover {
-                background: linear-gradient(135deg, rgba(0, 255, 136, 0.08), rgba(0, 212, 255, 0.05));
-                transform: translateX(8px) scale(1.02);
-                box-shadow: 0 8px 30px rgba(0, 255, 136, 0.3);
-            }
-            
-            .agent-card:hover::before {
-                opacity: 1;
-            }
-            
-            .agent-card.research { border-left-color: #00d4ff; }
-            .agent-card.execution { border-left-color: #ff9800; }
-            .agent-card.risk { border-left-color: #f44336; }
-            .agent-card.scalping { border-left-color: #9c27b0; }
-            .agent-card.swing { border-left-color: #4caf50; }
-            
-            .agent-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 12px;
-            }
-            
-            .agent-name {
-                font-weight: 700;
-                background: linear-gradient(135deg, #00ff88, #00d4ff);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                background-clip: text;
-                font-size: 14px;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-                font-family: 'JetBrains Mono', monospace;
-            }
-            
-            .agent-timestamp {
-                font-size: 11px;
-                color: #666;
-                font-family: 'JetBrains Mono', monospace;
-            }
-            
-            .agent-decision {
-                color: #fff;
-                font-size: 14px;
-                margin-bottom: 10px;
-                line-height: 1.6;
-                font-weight: 500;
-            }
-            
-            .agent-reasoning {
-                color: #aaa;
-                font-size: 13px;
-                line-height: 1.7;
-                margin-bottom: 12px;
-                padding: 10px;
-                background: rgba(0, 0, 0, 0.3);
-                border-radius: 6px;
-                border-left: 2px solid rgba(0, 255, 136, 0.3);
-            }
-            
-            .agent-footer {
-                display: flex;
-                gap: 20px;
-                font-size: 12px;
-                font-family: 'JetBrains Mono', monospace;
-            }
-            
-            .agent-confidence {
-                color: #00d4ff;
-                font-weight: 600;
-            }
-            
-            .agent-status {
-                color: #ff9800;
-                font-weight: 600;
-            }
-            
-            .agent-status.executed {
-                color: #4caf50;
-            }
-            
-            /* Orchestrator Pipeline */
-            .orchestrator-flow {
-                background: rgba(0, 0, 0, 0.3);
-                border-radius: 10px;
-                padding: 25px;
-                margin-top: 15px;
-            }
-            
-            .flow-node {
-                background: linear-gradient(135deg, rgba(0, 212, 255, 0.15) 0%, rgba(0, 255, 136, 0.15) 100%);
-                border: 2px solid rgba(0, 255, 136, 0.3);
-                border-radius: 10px;
-                padding: 15px;
-                margin-bottom: 20px;
-                position: relative;
-                transition: all 0.3s ease;
-            }
-            
-            .flow-node:hover {
-                border-color: rgba(0, 255, 136, 0.6);
-                box-shadow: 0 0 30px rgba(0, 255, 136, 0.3);
-            }
-            
-            .flow-node::after {
-                content: '↓';
-                position: absolute;
-                bottom: -25px;
-                left: 50%;
-                transform: translateX(-50%);
-                color: #00ff88;
-                font-size: 20px;
-                text-shadow: 0 0 10px #00ff88;
-            }
-            
-            .flow-node:last-child::after {
-                display: none;
-            }
-            
-            .flow-node-title {
-                font-weight: 700;
-                color: #00ff88;
-                font-size: 13px;
-                margin-bottom: 8px;
-                font-family: 'JetBrains Mono', monospace;
-            }
-            
-            .flow-node-content {
-                color: #ccc;
-                font-size: 12px;
-                line-height: 1.5;
-            }
-            
-            /* Chat Interface */
-            .chat-container {
-                display: flex;
-                flex-direction: column;
-                height: 500px;
-            }
-            
-            .chat-messages {
-                flex: 1;
-                overflow-y: auto;
-                padding: 20px;
-                background: rgba(0, 0, 0, 0.3);
-                border-radius: 10px;
-                margin-bottom: 15px;
-                border: 1px solid rgba(0, 255, 136, 0.2);
-            }
-            
-            .chat-message {
-                background: linear-gradient(135deg, rgba(0, 0, 0, 0.5), rgba(0, 212, 255, 0.05));
-                border-left: 3px solid #00d4ff;
-                border-radius: 10px;
-                padding: 15px;
-                margin-bottom: 15px;
-                transition: all 0.3s ease;
-                animation: slideIn 0.4s ease-out;
-            }
-            
-            @keyframes slideIn {
-                from {
-                    opacity: 0;
-                    transform: translateY(20px);
-                }
-                to {
-                    opacity: 1;
-                    transform: translateY(0);
-                }
-            }
-            
-            .chat-message:hover {
-                background: linear-gradient(135deg, rgba(0, 0, 0, 0.6), rgba(0, 212, 255, 0.1));
-                box-shadow: 0 4px 20px rgba(0, 212, 255, 0.2);
-            }
-            
-            .chat-message.assistant {
-                border-left-color: #00ff88;
-                background: linear-gradient(135deg, rgba(0, 0, 0, 0.5), rgba(0, 255, 136, 0.05));
-            }
-            
-            .chat-message.assistant:hover {
-                background: linear-gradient(135deg, rgba(0, 0, 0, 0.6), rgba(0, 255, 136, 0.1));
-                box-shadow: 0 4px 20px rgba(0, 255, 136, 0.2);
-            }
-            
-            .chat-message-header {
-                font-weight: 700;
-                font-size: 13px;
-                margin-bottom: 8px;
-                color: #00d4ff;
-                font-family: 'JetBrains Mono', monospace;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }
-            
-            .chat-message.assistant .chat-message-header {
-                color: #00ff88;
-            }
-            
-            .chat-message-content {
-                color: #e0e0e0;
-                font-size: 14px;
-                line-height: 1.7;
-            }
-            
-            .chat-input-container {
-                display: flex;
-                gap: 12px;
-            }
-            
-            .chat-input {
-                flex: 1;
-                background: rgba(0, 0, 0, 0.5) !important;
-                border: 2px solid #2d3748 !important;
-                border-radius: 10px !important;
-                padding: 15px !important;
-                color: #fff !important;
-                font-size: 14px !important;
-                font-family: 'Inter', sans-serif !important;
-                transition: all 0.3s ease !important;
-            }
-            
-            .chat-input:focus {
-                outline: none !important;
-                border-color: #00ff88 !important;
-                box-shadow: 0 0 20px rgba(0, 255, 136, 0.3) !important;
-                background: rgba(0, 0, 0, 0.7) !important;
-            }
-            
-            .chat-send-btn {
-                background: linear-gradient(135deg, #00ff88 0%, #00d4ff 100%);
-                color: #0a0e27;
-                border: none;
-                border-radius: 10px;
-                padding: 15px 35px;
-                font-weight: 700;
-                font-size: 14px;
-                cursor: pointer;
-                transition: all 0.4s ease;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-                box-shadow: 0 4px 20px rgba(0, 255, 136, 0.3);
-                font-family: 'JetBrains Mono', monospace;
-            }
-            
-            .chat-send-btn:hover {
-                transform: translateY(-3px) scale(1.05);
-                box-shadow: 0 8px 30px rgba(0, 255, 136, 0.5);
-                background: linear-gradient(135deg, #00d4ff 0%, #00ff88 100%);
-            }
-            
-            .chat-send-btn:active {
-                transform: translateY(-1px) scale(1.02);
-            }
-            
-            /* Trade List */
-            .trade-item {
-                background: linear-gradient(135deg, rgba(0, 0, 0, 0.4), rgba(0, 0, 0, 0.2));
-                border-radius: 10px;
-                padding: 15px;
-                margin-bottom: 10px;
-                border-left: 4px solid transparent;
-                transition: all 0.4s ease;
-            }
-            
-            .trade-item.buy {
-                border-left-color: #00ff88;
-            }
-            
-            .trade-item.sell {
-                border-left-color: #ff5252;
-            }
-            
-            .trade-item:hover {
-                background: linear-gradient(135deg, rgba(0, 0, 0, 0.6), rgba(0, 255, 136, 0.05));
-                transform: translateX(8px) scale(1.02);
-                box-shadow: 0 6px 25px rgba(0, 255, 136, 0.2);
-            }
-            
-            .trade-header {
-                display: flex;
-                justify-content: space-between;
-                margin-bottom: 8px;
-            }
-            
-            .trade-symbol {
-                font-weight: 700;
-                color: #fff;
-                font-size: 14px;
-                font-family: 'JetBrains Mono', monospace;
-            }
-            
-            .trade-side {
-                font-weight: 700;
-                font-size: 13px;
-                font-family: 'JetBrains Mono', monospace;
-                text-shadow: 0 0 10px currentColor;
-            }
-            
-            .trade-side.buy {
-                color: #00ff88;
-            }
-            
-            .trade-side.sell {
-                color: #ff5252;
-            }
-            
-            .trade-details {
-                display: flex;
-                gap: 20px;
-                font-size: 12px;
-                color: #888;
-                font-family: 'JetBrains Mono', monospace;
-            }
-            
-            /* Exchange Balance Card */
-            .exchange-card {
-                background: linear-gradient(135deg, rgba(0, 0, 0, 0.4), rgba(0, 0, 0, 0.2));
-                border: 1px solid #2d3748;
-                border-radius: 10px;
-                padding: 18px;
-                margin-bottom: 15px;
-                transition: all 0.3s ease;
-            }
-            
-            .exchange-card:hover {
-                border-color: rgba(0, 255, 136, 0.5);
-                box-shadow: 0 6px 25px rgba(0, 255, 136, 0.2);
-                transform: scale(1.02);
-            }
-            
-            .exchange-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 12px;
-            }
-            
-            .exchange-name {
-                font-weight: 700;
-                font-size: 15px;
-                color: #00ff88;
-                font-family: 'JetBrains Mono', monospace;
-                text-transform: uppercase;
-            }
-            
-            .exchange-status {
-                font-size: 11px;
-                padding: 4px 10px;
-                border-radius: 12px;
-                font-family: 'JetBrains Mono', monospace;
-                font-weight: 600;
-            }
-            
-            .exchange-status.connected {
-                background: rgba(0, 255, 136, 0.2);
-                color: #00ff88;
-                border: 1px solid rgba(0, 255, 136, 0.4);
-            }
-            
-            .exchange-status.error {
-                background: rgba(255, 82, 82, 0.2);
-                color: #ff5252;
-                border: 1px solid rgba(255, 82, 82, 0.4);
-            }
-            
-            .exchange-balance {
-                font-size: 24px;
-                font-weight: 800;
-                color: #fff;
-                font-family: 'JetBrains Mono', monospace;
-                margin-bottom: 10px;
-            }
-            
-            .asset-list {
-                display: flex;
-                flex-direction: column;
-                gap: 8px;
-            }
-            
-            .asset-item {
-                display: flex;
-                justify-content: space-between;
-                padding: 8px 12px;
-                background: rgba(0, 0, 0, 0.3);
-                border-radius: 6px;
-                font-size: 12px;
-                font-family: 'JetBrains Mono', monospace;
-                transition: all 0.3s ease;
-            }
-            
-            .asset-item:hover {
-                background: rgba(0, 255, 136, 0.1);
-            }
-            
-            .asset-name {
-                color: #00d4ff;
-                font-weight: 600;
-            }
-            
-            .asset-amount {
-                color: #fff;
-                font-weight: 700;
-            }
-            
-            /* Scrollbar */
-            ::-webkit-scrollbar {
-                width: 10px;
-                height: 10px;
-            }
-            
-            ::-webkit-scrollbar-track {
-                background: rgba(0, 0, 0, 0.3);
-                border-radius: 10px;
-            }
-            
-            ::-webkit-scrollbar-thumb {
-                background: linear-gradient(135deg, #00ff88 0%, #00d4ff 100%);
-                border-radius: 10px;
-                box-shadow: 0 0 10px rgba(0, 255, 136, 0.5);
-            }
-            
-            ::-webkit-scrollbar-thumb:hover {
-                background: linear-gradient(135deg, #00d4ff 0%, #00ff88 100%);
-                box-shadow: 0 0 15px rgba(0, 255, 136, 0.7);
-            }
-            
-            /* Responsive Grid Columns */
-            .col-12 { grid-column: span 12; }
-            .col-6 { grid-column: span 6; }
-            .col-4 { grid-column: span 4; }
-            .col-3 { grid-column: span 3; }
-            .col-8 { grid-column: span 8; }
-            
-            /* Loading Animation */
-            .loading {
-                display: inline-block;
-                width: 14px;
-                height: 14px;
-                border: 3px solid rgba(0, 255, 136, 0.3);
-                border-radius: 50%;
-                border-top-color: #00ff88;
-                animation: spin 1s linear infinite;
-            }
-            
-            @keyframes spin {
-                to { transform: rotate(360deg); }
-            }
-            
-            /* Alert Badge */
-            .alert-badge {
-                background: linear-gradient(135deg, rgba(255, 82, 82, 0.2), rgba(255, 152, 0, 0.2));
-                border: 1px solid rgba(255, 82, 82, 0.4);
-                color: #ff5252;
-                padding: 6px 14px;
-                border-radius: 20px;
-                font-size: 11px;
-                font-weight: 600;
-                font-family: 'JetBrains Mono', monospace;
-            }
-        </style>
+        <link rel="stylesheet" href="''' + static_url('stunning_dashboard.css') + '''">
     </head>
     <body>
         {%app_entry%}
         <footer>
             {%config%}
             {%scripts%}
+            <script src="''' + static_url('stunning_dashboard.js') + '''"></script>
             {%renderer%}
         </footer>
     </body>
 </html>
 '''
 
+def build_portfolio_figure():
+    """Static portfolio chart; updates only patch the trace's x/y"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=[],
+        y=[],
+        mode='lines',
+        fill='tozeroy',
+        line=dict(color='#00ff88', width=3, shape='spline'),
+        fillcolor='rgba(0, 255, 136, 0.1)',
+        name='Portfolio Value'
+    ))
+    
+    fig.add_hline(y=STARTING_CAPITAL, line_dash="dash", line_color="#ff5252", 
+                  annotation_text=f"Starting Capital: ${STARTING_CAPITAL:.2f}", 
+                  annotation_position="right")
+    
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0.2)',
+        font=dict(family='JetBrains Mono', color='#e0e0e0', size=12),
+        margin=dict(l=20, r=20, t=20, b=20),
+        xaxis=dict(
+            gridcolor='rgba(255,255,255,0.1)',
+            showgrid=True,
+            zeroline=False
+        ),
+        yaxis=dict(
+            gridcolor='rgba(255,255,255,0.1)',
+            showgrid=True,
+            zeroline=False
+        ),
+        hovermode='x unified',
+        showlegend=False
+    )
+    return fig
+
+PORTFOLIO_FIGURE = build_portfolio_figure()
+
 # Layout
 app.layout = html.Div([
     
@@ -1283,7 +1209,7 @@ app.layout = html.Div([
         html.Div([
             html.Div([
                 html.Div("📈 Portfolio Value", className='panel-header'),
-                dcc.Graph(id='portfolio-chart', config={'displayModeBar': False}, style={'height': '350px'})
+                dcc.Graph(id='portfolio-chart', figure=PORTFOLIO_FIGURE, config={'displayModeBar': False}, style={'height': '350px'})
             ], className='terminal-panel')
         ], className='col-8'),
         
@@ -1352,18 +1278,49 @@ app.layout = html.Div([
         
     ], className='terminal-grid'),
     
-    # Update interval
+    # Update interval (chat)
     dcc.Interval(id='interval-update', interval=10000, n_intervals=0),
     
+    # Clock, ticked entirely in the browser
+    dcc.Interval(id='clock-tick', interval=1000, n_intervals=0),
+    
+    # Data panels refresh on server push; each panel also polls at its own pace in case the stream drops
+    html.Button(id='live-push', n_clicks=0, style={'display': 'none'}),
+    # Clicked by the page script when the tab is hidden or shown, to pause the intervals
+    html.Button(id='visibility-change', n_clicks=0, style={'display': 'none'}),
+    # Debounced chat sends (timestamp of the accepted click), and the messages to show;
+    # chat-push is clicked by the page script on each chat event from the server
+    dcc.Store(id='chat-submit'),
+    dcc.Store(id='chat-data'),
+    html.Button(id='chat-push', n_clicks=0, style={'display': 'none'}),
+    dcc.Interval(id='portfolio-update', interval=10000, n_intervals=0),
+    dcc.Interval(id='agents-update', interval=30000, n_intervals=0),
+    dcc.Interval(id='orchestrator-update', interval=60000, n_intervals=0),
+    
+    # Digest of the data each panel last rendered; unchanged data skips the re-render
+    dcc.Store(id='portfolio-digest'),
+    dcc.Store(id='chart-digest'),
+    dcc.Store(id='agents-digest'),
+    dcc.Store(id='orchestrator-digest'),
+    dcc.Store(id='trades-digest'),
+    
+    # Flat rows for the card panels; the browser turns them into cards (static/stunning_dashboard.js)
+    dcc.Store(id='exchange-data'),
+    dcc.Store(id='agent-data'),
+    dcc.Store(id='trade-data'),
+    
 ], style={'minHeight': '100vh'})
 
+def data_digest(*parts):
+    """Short fingerprint of the data behind a panel, to skip re-rendering unchanged data"""
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
 # Callbacks
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace='stunning', function_name='clock'),
     Output('current-time', 'children'),
-    Input('interval-update', 'n_intervals')
+    Input('clock-tick', 'n_intervals')
 )
-def update_time(n):
-    return datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
 
 @app.callback(
     [Output('portfolio-value', 'children'),
@@ -1374,107 +1331,49 @@ def update_time(n):
      Output('total-pnl-pct', 'children'),
      Output('open-positions', 'children'),
      Output('position-exposure', 'children'),
-     Output('exchange-balances', 'children'),
-     Output('portfolio-chart', 'figure')],
-    Input('interval-update', 'n_intervals')
+     Output('exchange-data', 'data'),
+     Output('portfolio-chart', 'figure'),
+     Output('portfolio-digest', 'data'),
+     Output('chart-digest', 'data')],
+    [Input('portfolio-update', 'n_intervals'),
+     Input('live-push', 'n_clicks')],
+    [State('portfolio-digest', 'data'),
+     State('chart-digest', 'data')]
 )
-def update_portfolio_metrics(n):
+def update_portfolio_metrics(n, pushes, last_digest, last_chart_digest):
     try:
-        print(f"\n=== UPDATE PORTFOLIO METRICS (interval {n}) ===")
-        # Get REAL balances from exchanges
-        prices = get_crypto_prices()
-        print(f"Prices: {prices}")
+        logger.debug("Update portfolio metrics (interval %s)", n)
+        # Get REAL balances from exchanges, alongside the DB reads
+        prices_future, balance_futures = fetch_balances_concurrently()
+        open_pos_future = IO_POOL.submit(get_open_positions_from_db)
+        history_future = IO_POOL.submit(get_trade_history_from_db)
+        prices, open_pos, trade_history, *balance_results = gather_results(
+            [prices_future, open_pos_future, history_future, *balance_futures.values()]
+        )
+        balances = dict(zip(balance_futures, balance_results))
         
-        total_usd = 0
-        exchange_cards = []
+        digest = data_digest(prices, balances, open_pos, trade_history)
+        if digest == last_digest:
+            raise PreventUpdate
+        logger.debug("Prices: %r", prices)
         
-        # Kraken balance
-        kraken_balance, kraken_error = get_cached_or_fetch('kraken_balance', lambda: fetch_real_balance('kraken'), ttl=30)
-        kraken_usd = 0
-        kraken_assets = []
+        total_usd = 0
+        exchanges = []
         
-        if kraken_error:
-            print(f"Kraken error: {kraken_error}")
-            exchange_cards.append(html.Div([
-                html.Div([
-                    html.Div("Kraken", className='exchange-name'),
-                    html.Div("⚠️ API Error", className='exchange-status error')
-                ], className='exchange-header'),
-                html.Div("$0.00", className='exchange-balance'),
-                html.Div(kraken_error, style={'fontSize': '11px', 'color': '#ff5252'})
-            ], className='exchange-card'))
-        else:
-            print(f"Kraken balance: {kraken_balance}")
-            for asset, amount in kraken_balance.items():
-                if amount > 0.0001:
-                    # Handle USD and stablecoins directly
-                    if asset in ['USD', 'USDT', 'USDC', 'DAI', 'BUSD']:
-                        asset_value = amount
-                    # Skip unknown assets like EUR.HOLD
-                    elif asset in prices:
-                        asset_value = amount * prices[asset]
-                    else:
-                        continue  # Skip assets we don't have prices for
-                    kraken_usd += asset_value
-                    kraken_assets.append(html.Div([
-                        html.Span(asset, className='asset-name'),
-                        html.Span(f"{amount:.8f}", className='asset-amount')
-                    ], className='asset-item'))
+        for name, (balance, error) in balances.items():
+            label, error_status, error_detail = EXCHANGE_DISPLAY[name]
             
-            total_usd += kraken_usd
-            exchange_cards.append(html.Div([
-                html.Div([
-                    html.Div("Kraken", className='exchange-name'),
-                    html.Div("✅ Connected", className='exchange-status connected')
-                ], className='exchange-header'),
-                html.Div(f"${kraken_usd:.2f}", className='exchange-balance'),
-                html.Div(kraken_assets if kraken_assets else html.Div("No assets", style={'color': '#666', 'fontSize': '12px'}), className='asset-list')
-            ], className='exchange-card'))
-        
-        # Binance balance
-        binance_balance, binance_error = get_cached_or_fetch('binance_balance', lambda: fetch_real_balance('binance'), ttl=30)
-        binance_usd = 0
-        binance_assets = []
-        
-        if binance_error:
-            print(f"Binance error: {binance_error}")
-            exchange_cards.append(html.Div([
-                html.Div([
-                    html.Div("Binance", className='exchange-name'),
-                    html.Div("🚫 Geo-blocked", className='exchange-status error')
-                ], className='exchange-header'),
-                html.Div("$0.00", className='exchange-balance'),
-                html.Div("Unable to access from this region", style={'fontSize': '11px', 'color': '#ff5252'})
-            ], className='exchange-card'))
-        else:
-            print(f"Binance balance: {binance_balance}")
-            for asset, amount in binance_balance.items():
-                if amount > 0.0001:
-                    # Handle USD and stablecoins directly
-                    if asset in ['USD', 'USDT', 'USDC', 'DAI', 'BUSD']:
-                        asset_value = amount
-                    # Skip unknown assets
-                    elif asset in prices:
-                        asset_value = amount * prices[asset]
-                    else:
-                        continue  # Skip assets we don't have prices for
-                    binance_usd += asset_value
-                    binance_assets.append(html.Div([
-                        html.Span(asset, className='asset-name'),
-                        html.Span(f"{amount:.8f}", className='asset-amount')
-                    ], className='asset-item'))
+            if error:
+                logger.warning("%s error: %s", label, error)
+                exchanges.append({'name': label, 'status': error_status, 'error': error_detail or error})
+                continue
             
-            total_usd += binance_usd
-            exchange_cards.append(html.Div([
-                html.Div([
-                    html.Div("Binance", className='exchange-name'),
-                    html.Div("✅ Connected", className='exchange-status connected')
-                ], className='exchange-header'),
-                html.Div(f"${binance_usd:.2f}", className='exchange-balance'),
-                html.Div(binance_assets if binance_assets else html.Div("No assets", style={'color': '#666', 'fontSize': '12px'}), className='asset-list')
-            ], className='exchange-card'))
+            logger.debug("%s balance: %r", label, balance)
+            exchange_usd, held = value_balance(balance, prices)
+            total_usd += exchange_usd
+            exchanges.append({'name': label, 'usd': exchange_usd, 'assets': held})
         
-        print(f"Total USD: ${total_usd:.2f}")
+        logger.debug("Total USD: $%.2f", total_usd)
         
         # Calculate P&L
         pnl = total_usd - STARTING_CAPITAL
@@ -1494,83 +1393,27 @@ def update_portfolio_metrics(n):
         total_pnl_pct_text = f"{'+' if pnl >= 0 else ''}{pnl_pct:.2f}% from ${STARTING_CAPITAL:.2f}"
         
         # Open positions (from database)
-        try:
-            conn = get_db_connection()
-            cur = conn.cursor()
-            cur.execute("SELECT COUNT(*) as count FROM trades WHERE status = 'open'")
-            open_pos = cur.fetchone()['count']
-            cur.close()
-            conn.close()
-            print(f"Open positions: {open_pos}")
-        except Exception as e:
-            print(f"Error fetching open positions: {e}")
-            open_pos = 0
-        
         open_positions = str(open_pos)
         position_exposure = f"{open_pos} active position(s)"
         
-        # Create portfolio chart
-        fig = go.Figure()
-        
-        # Get historical data from database
-        try:
-            conn = get_db_connection()
-            cur = conn.cursor()
-            cur.execute("""
-                SELECT timestamp, SUM(pnl) OVER (ORDER BY timestamp) as cumulative_pnl
-                FROM trades
-                ORDER BY timestamp DESC
-                LIMIT 50
-            """)
-            trade_history = cur.fetchall()
-            cur.close()
-            conn.close()
-            print(f"Trade history records: {len(trade_history)}")
-        except Exception as e:
-            print(f"Error fetching trade history: {e}")
-            trade_history = []
-        
-        if trade_history:
-            timestamps = [t['timestamp'] for t in reversed(trade_history)]
-            values = [STARTING_CAPITAL + float(t['cumulative_pnl']) for t in reversed(trade_history)]
+        # Historical data from database; the series is only resent when it changed,
+        # not on every balance or price move (the flat fallback line follows the total)
+        chart_digest = data_digest(trade_history or round(total_usd, 2))
+        if chart_digest == last_chart_digest:
+            chart = no_update
         else:
-            timestamps = [datetime.now() - timedelta(hours=i) for i in range(24, 0, -1)]
-            values = [total_usd] * 24
-        
-        fig.add_trace(go.Scatter(
-            x=timestamps,
-            y=values,
-            mode='lines',
-            fill='tozeroy',
-            line=dict(color='#00ff88', width=3, shape='spline'),
-            fillcolor='rgba(0, 255, 136, 0.1)',
-            name='Portfolio Value'
-        ))
-        
-        fig.add_hline(y=STARTING_CAPITAL, line_dash="dash", line_color="#ff5252", 
-                      annotation_text=f"Starting Capital: ${STARTING_CAPITAL:.2f}", 
-                      annotation_position="right")
-        
-        fig.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0.2)',
-            font=dict(family='JetBrains Mono', color='#e0e0e0', size=12),
-            margin=dict(l=20, r=20, t=20, b=20),
-            xaxis=dict(
-                gridcolor='rgba(255,255,255,0.1)',
-                showgrid=True,
-                zeroline=False
-            ),
-            yaxis=dict(
-                gridcolor='rgba(255,255,255,0.1)',
-                showgrid=True,
-                zeroline=False
-            ),
-            hovermode='x unified',
-            showlegend=False
-        )
+            if trade_history:
+                timestamps = [timestamp for timestamp, _ in reversed(trade_history)]
+                values = [STARTING_CAPITAL + float(cumulative_pnl) for _, cumulative_pnl in reversed(trade_history)]
+            else:
+                timestamps = [datetime.now() - timedelta(hours=i) for i in range(24, 0, -1)]
+                values = [total_usd] * 24
+            
+            # Only the series changes between updates; the styling lives in PORTFOLIO_FIGURE
+            chart = Patch()
+            chart['data'][0]['x'] = timestamps
+            chart['data'][0]['y'] = values
         
-        print("=== UPDATE COMPLETE ===\n")
         
         return (
             portfolio_value,
@@ -1581,127 +1424,82 @@ def update_portfolio_metrics(n):
             html.Span(total_pnl_pct_text, className=portfolio_change_class),
             open_positions,
             position_exposure,
-            html.Div(exchange_cards),
-            fig
+            exchanges,
+            chart,
+            digest,
+            chart_digest
         )
         
+    except PreventUpdate:
+        raise
     except Exception as e:
-        print(f"CRITICAL Error in update_portfolio_metrics: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("CRITICAL Error in update_portfolio_metrics")
         return (
             "$0.00", "Error", "$0.00", "Error", "$0.00", "Error", "0", "Error",
-            html.Div(f"Error loading balances: {str(e)}", style={'color': '#ff5252'}), {}
+            {'error': f"Error loading balances: {str(e)}"}, no_update, None, no_update
         )
 
 @app.callback(
-    [Output('agent-insights', 'children'),
-     Output('agent-count', 'children')],
-    Input('interval-update', 'n_intervals')
+    [Output('agent-data', 'data'),
+     Output('agent-count', 'children'),
+     Output('agents-digest', 'data')],
+    [Input('agents-update', 'n_intervals'),
+     Input('live-push', 'n_clicks')],
+    State('agents-digest', 'data')
 )
-def update_agent_insights(n):
+def update_agent_insights(n, pushes, last_digest):
     try:
-        print(f"\n=== UPDATE AGENT INSIGHTS (interval {n}) ===")
+        logger.debug("Update agent insights (interval %s)", n)
         decisions = get_agent_decisions_from_db()
         
-        if not decisions:
-            print("No agent decisions found")
-            return html.Div("No agent decisions yet. Agents are initializing...", style={'color': '#666', 'textAlign': 'center', 'padding': '20px'}), "0 AGENTS"
-        
-        agent_cards = []
-        agent_names = set()
-        
-        for decision in decisions[:15]:  # Show last 15 decisions
-            agent_names.add(decision['agent_name'])
-            
-            # Determine agent type for styling
-            agent_type = 'research'
-            if 'execution' in decision['agent_name'].lower():
-                agent_type = 'execution'
-            elif 'risk' in decision['agent_name'].lower():
-                agent_type = 'risk'
-            elif 'scalp' in decision['agent_name'].lower():
-                agent_type = 'scalping'
-            elif 'swing' in decision['agent_name'].lower():
-                agent_type = 'swing'
-            
-            # Format timestamp
-            ts = decision['timestamp'].strftime('%H:%M:%S') if decision['timestamp'] else 'N/A'
-            
-            # Determine status based on executed flag
-            status_text = "Executed" if decision.get('executed') else "Pending"
-            status_class = 'executed' if decision.get('executed') else ''
-            
-            agent_cards.append(html.Div([
-                html.Div([
-                    html.Div(decision['agent_name'], className='agent-name'),
-                    html.Div(ts, className='agent-timestamp')
-                ], className='agent-header'),
-                html.Div(decision['decision'] or 'Analyzing...', className='agent-decision'),
-                html.Div(decision['reasoning'] or 'No detailed reasoning available', className='agent-reasoning'),
-                html.Div([
-                    html.Span(f"Confidence: {decision['confidence']:.1%}" if decision['confidence'] else "Confidence: N/A", className='agent-confidence'),
-                    html.Span(f"Status: {status_text}", className=f'agent-status {status_class}')
-                ], className='agent-footer')
-            ], className=f'agent-card {agent_type}'))
-        
-        print(f"Rendered {len(agent_cards)} agent cards, {len(agent_names)} unique agents")
-        print("=== UPDATE COMPLETE ===\n")
-        return html.Div(agent_cards), f"{len(agent_names)} ACTIVE"
+        digest = data_digest(decisions)
+        if digest == last_digest:
+            raise PreventUpdate
         
+        if not decisions:
+            logger.debug("No agent decisions found")
+            return [], "0 AGENTS", digest
+        
+        rows = [{
+            'agent': decision.agent_name,
+            'ts': decision.timestamp.strftime('%H:%M:%S') if decision.timestamp else 'N/A',
+            'decision': decision.decision,
+            'reasoning': decision.reasoning,
+            'confidence': float(decision.confidence) if decision.confidence else None,
+            'executed': bool(decision.executed)
+        } for decision in decisions[:15]]  # Show last 15 decisions
+        agent_names = {row['agent'] for row in rows}
+        
+        logger.debug("Sent %d agent rows, %d unique agents", len(rows), len(agent_names))
+        return rows, f"{len(agent_names)} ACTIVE", digest
+        
+    except PreventUpdate:
+        raise
     except Exception as e:
-        print(f"Error in update_agent_insights: {e}")
-        import traceback
-        traceback.print_exc()
-        return html.Div(f"Error: {str(e)}", style={'color': '#ff5252'}), "ERROR"
+        logger.exception("Error in update_agent_insights")
+        return {'error': f"Error: {str(e)}"}, "ERROR", None
 
 @app.callback(
     [Output('orchestrator-viz', 'children'),
-     Output('orchestrator-status', 'children')],
-    Input('interval-update', 'n_intervals')
+     Output('orchestrator-status', 'children'),
+     Output('orchestrator-digest', 'data')],
+    [Input('orchestrator-update', 'n_intervals'),
+     Input('live-push', 'n_clicks')],
+    State('orchestrator-digest', 'data')
 )
-def update_orchestrator(n):
+def update_orchestrator(n, pushes, last_digest):
     try:
-        print(f"\n=== UPDATE ORCHESTRATOR (interval {n}) ===")
+        logger.debug("Update orchestrator (interval %s)", n)
         
         # Get REAL data from database
-        conn = get_db_connection()
-        cur = conn.cursor()
+        counts, error = get_panel_data('orchestrator_counts', get_orchestrator_counts_from_db)
+        if not counts:
+            raise RuntimeError(error or "No orchestrator counts")
+        active_agents, recent_decisions, risk_checks, recent_trades = counts
         
-        # Count active agents (agents that made decisions in last 5 minutes)
-        cur.execute("""
-            SELECT COUNT(DISTINCT agent_name)
-            FROM agent_decisions
-            WHERE timestamp > NOW() - INTERVAL '5 minutes'
-        """)
-        active_agents = cur.fetchone()[0] or 0
-        
-        # Count recent decisions (last 1 minute)
-        cur.execute("""
-            SELECT COUNT(*)
-            FROM agent_decisions
-            WHERE timestamp > NOW() - INTERVAL '1 minute'
-        """)
-        recent_decisions = cur.fetchone()[0] or 0
-        
-        # Check risk manager activity (last 5 minutes)
-        cur.execute("""
-            SELECT COUNT(*)
-            FROM risk_metrics
-            WHERE timestamp > NOW() - INTERVAL '5 minutes'
-        """)
-        risk_checks = cur.fetchone()[0] or 0
-        
-        # Count recent trades (last 5 minutes)
-        cur.execute("""
-            SELECT COUNT(*)
-            FROM trades
-            WHERE executed_at > NOW() - INTERVAL '5 minutes'
-        """)
-        recent_trades = cur.fetchone()[0] or 0
-        
-        cur.close()
-        conn.close()
+        digest = data_digest(active_agents, recent_decisions, risk_checks, recent_trades)
+        if digest == last_digest:
+            raise PreventUpdate
         
         pipeline_steps = [
             {
@@ -1735,112 +1533,182 @@ def update_orchestrator(n):
             ], className=node_class))
         
         status = "OPERATIONAL" if active_agents > 0 else "IDLE"
-        print(f"Orchestrator: {active_agents} agents, {recent_decisions} decisions, {risk_checks} risk checks, {recent_trades} trades")
-        return html.Div(flow_nodes, className='orchestrator-flow'), status
+        logger.debug("Orchestrator: %d agents, %d decisions, %d risk checks, %d trades", active_agents, recent_decisions, risk_checks, recent_trades)
+        return html.Div(flow_nodes, className='orchestrator-flow'), status, digest
         
+    except PreventUpdate:
+        raise
     except Exception as e:
-        print(f"Error in update_orchestrator: {e}")
-        import traceback
-        traceback.print_exc()
-        return html.Div(f"Error: {str(e)}", style={'color': '#ff5252'}), "ERROR"
+        logger.exception("Error in update_orchestrator")
+        return html.Div(f"Error: {str(e)}", style={'color': '#ff5252'}), "ERROR", None
 
 @app.callback(
-    Output('recent-trades', 'children'),
-    Input('interval-update', 'n_intervals')
+    [Output('trade-data', 'data'),
+     Output('trades-digest', 'data')],
+    [Input('agents-update', 'n_intervals'),
+     Input('live-push', 'n_clicks')],
+    State('trades-digest', 'data')
 )
-def update_recent_trades(n):
+def update_recent_trades(n, pushes, last_digest):
     try:
-        print(f"\n=== UPDATE RECENT TRADES (interval {n}) ===")
-        trades = get_recent_trades_from_db()
-        
-        if not trades:
-            print("No trades found")
-            return html.Div("No trades yet. System is monitoring markets...", style={'color': '#666', 'textAlign': 'center', 'padding': '20px'})
-        
-        trade_items = []
-        for trade in trades[:10]:
-            ts = trade['timestamp'].strftime('%m/%d %H:%M') if trade['timestamp'] else 'N/A'
-            side_class = 'buy' if trade['side'] == 'buy' else 'sell'
-            
-            # Convert decimals to float for display
-            quantity = float(trade['quantity']) if trade['quantity'] else 0
-            price = float(trade['price']) if trade['price'] else 0
-            
-            trade_items.append(html.Div([
-                html.Div([
-                    html.Div(trade['symbol'], className='trade-symbol'),
-                    html.Div(trade['side'].upper(), className=f'trade-side {side_class}')
-                ], className='trade-header'),
-                html.Div([
-                    html.Span(f"Qty: {quantity:.8f}"),
-                    html.Span(f"Price: ${price:.2f}"),
-                    html.Span(f"{ts}")
-                ], className='trade-details')
-            ], className=f'trade-item {side_class}'))
+        logger.debug("Update recent trades (interval %s)", n)
+        trades, _ = get_panel_data('recent_trades', get_recent_trades_from_db)
         
-        print(f"Rendered {len(trade_items)} trade items")
-        print("=== UPDATE COMPLETE ===\n")
-        return html.Div(trade_items)
+        digest = data_digest(trades)
+        if digest == last_digest:
+            raise PreventUpdate
         
+        if not trades:
+            logger.debug("No trades found")
+            return [], digest
+        
+        # Convert decimals to float for display
+        rows = [{
+            'symbol': trade.symbol,
+            'side': trade.side,
+            'quantity': float(trade.quantity) if trade.quantity else 0,
+            'price': float(trade.price) if trade.price else 0,
+            'epoch': trade.epoch
+        } for trade in trades]
+        
+        logger.debug("Sent %d trade rows", len(rows))
+        return rows, digest
+        
+    except PreventUpdate:
+        raise
     except Exception as e:
-        print(f"Error in update_recent_trades: {e}")
-        import traceback
-        traceback.print_exc()
-        return html.Div(f"Error: {str(e)}", style={'color': '#ff5252'})
+        logger.exception("Error in update_recent_trades")
+        return {'error': f"Error: {str(e)}"}, None
 
-@app.callback(
-    [Output('chat-history', 'children'),
-     Output('chat-input', 'value')],
-    [Input('chat-send', 'n_clicks'),
-     Input('interval-update', 'n_intervals')],
-    State('chat-input', 'value')
+# Repeat clicks on SEND within 500ms are dropped in the browser before they reach GPT-5
+app.clientside_callback(
+    ClientsideFunction(namespace='stunning', function_name='debounceSend'),
+    Output('chat-submit', 'data'),
+    Input('chat-send', 'n_clicks')
 )
-def update_chat(n_clicks, n_intervals, user_message):
-    global chat_history
-    
-    with chat_lock:
-        # If user sent a message
-        if n_clicks and n_clicks > 0 and user_message:
-            print(f"\n=== CHAT MESSAGE ===")
-            print(f"User: {user_message}")
-            
-            # Add user message to history
-            chat_history.append({
-                'role': 'user',
-                'content': user_message
-            })
-            
-            # Get response from GPT-5
-            assistant_response = chat_with_gpt5(user_message, chat_history[:-1])
-            print(f"Assistant: {assistant_response}")
-            
-            # Add assistant response to history
+
+# Hidden tabs stop polling; the page script clicks visibility-change on every switch
+app.clientside_callback(
+    ClientsideFunction(namespace='stunning', function_name='pauseWhenHidden'),
+    [Output('interval-update', 'disabled'),
+     Output('portfolio-update', 'disabled'),
+     Output('agents-update', 'disabled'),
+     Output('orchestrator-update', 'disabled')],
+    Input('visibility-change', 'n_clicks')
+)
+
+# Card panels are rendered in the browser from the flat rows above
+app.clientside_callback(
+    ClientsideFunction(namespace='stunning', function_name='renderExchanges'),
+    Output('exchange-balances', 'children'),
+    Input('exchange-data', 'data')
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='stunning', function_name='renderAgents'),
+    Output('agent-insights', 'children'),
+    Input('agent-data', 'data')
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='stunning', function_name='renderTrades'),
+    Output('recent-trades', 'children'),
+    Input('trade-data', 'data')
+)
+
+def chat_tail(count):
+    """The last count messages of chat_history, without copying the rest"""
+    return list(islice(chat_history, max(len(chat_history) - count, 0), None))
+
+def chat_payload():
+    """Last messages for the clientside chat renderer, with the overall index of the first"""
+    messages = chat_tail(CHAT_DISPLAY_MESSAGES)
+    return {
+        'version': chat_version,
+        'first': chat_version - len(messages),
+        'messages': [(msg['role'], msg['content']) for msg in messages]
+    }
+
+# GPT-5 replies are produced by one worker thread, in the order messages were sent, so
+# no callback waits on the model; chat_lock only guards chat_history and chat_version
+chat_requests = queue.Queue()
+chat_worker_thread = None
+
+def answer_chat_requests():
+    """Worker: answer queued (message, context) pairs and announce each reply"""
+    global chat_version
+    while True:
+        user_message, context = chat_requests.get()
+        # Get response from GPT-5
+        assistant_response = chat_with_gpt5(user_message, context)
+        logger.debug("Chat assistant: %s", assistant_response)
+        
+        # Add assistant response to history
+        with chat_lock:
             chat_history.append({
                 'role': 'assistant',
                 'content': assistant_response
             })
-            print("=== CHAT COMPLETE ===\n")
-        
-        # Render chat messages
-        messages = []
-        for msg in chat_history[-10:]:  # Show last 10 messages
-            message_class = 'assistant' if msg['role'] == 'assistant' else 'user'
-            header_text = '🤖 GPT-5 ASSISTANT' if msg['role'] == 'assistant' else '👤 YOU'
-            
-            messages.append(html.Div([
-                html.Div(header_text, className='chat-message-header'),
-                html.Div(msg['content'], className='chat-message-content')
-            ], className=f'chat-message {message_class}'))
-        
-        if not messages:
-            messages = [html.Div([
-                html.Div("👋 Welcome! I'm your GPT-5 AI trading assistant with function calling.", style={'color': '#00ff88', 'fontWeight': 'bold', 'marginBottom': '10px'}),
-                html.Div("Ask me about your portfolio, agent decisions, trading performance, or market analysis. I can query the database in real-time!", style={'color': '#aaa'})
-            ], style={'textAlign': 'center', 'padding': '40px 20px'})]
+            chat_version += 1
+        announce_chat()
+
+def ensure_chat_worker():
+    """Start the chat worker thread on first use in this process"""
+    global chat_worker_thread
+    with chat_lock:
+        if chat_worker_thread is None:
+            chat_worker_thread = threading.Thread(target=answer_chat_requests, daemon=True)
+            chat_worker_thread.start()
+
+@app.callback(
+    [Output('chat-data', 'data', allow_duplicate=True),
+     Output('chat-input', 'value')],
+    Input('chat-submit', 'data'),
+    State('chat-input', 'value'),
+    prevent_initial_call=True
+)
+def send_chat(submitted, user_message):
+    global chat_version
+    
+    if not user_message:
+        raise PreventUpdate
+    
+    ensure_chat_worker()
+    logger.debug("Chat user: %s", user_message)
+    with chat_lock:
+        context = chat_tail(CHAT_CONTEXT_MESSAGES)
         
-        # Clear input only when a message was actually sent
-        clear_input = '' if (n_clicks and n_clicks > 0 and user_message) else dash.no_update
-        return html.Div(messages), clear_input
+        # Add user message to history
+        chat_history.append({
+            'role': 'user',
+            'content': user_message
+        })
+        chat_version += 1
+        payload = chat_payload()
+    
+    # The reply arrives later through refresh_chat, on the worker's chat event
+    chat_requests.put((user_message, context))
+    announce_chat()
+    return payload, ''
+
+@app.callback(
+    Output('chat-data', 'data'),
+    [Input('interval-update', 'n_intervals'),
+     Input('chat-push', 'n_clicks')],
+    State('chat-data', 'data')
+)
+def refresh_chat(n_intervals, pushes, shown):
+    # Picks up replies and messages sent from other pages; sends nothing when this page is current
+    if shown and shown['version'] == chat_version:
+        raise PreventUpdate
+    with chat_lock:
+        return chat_payload()
+
+app.clientside_callback(
+    ClientsideFunction(namespace='stunning', function_name='renderChat'),
+    Output('chat-history', 'children'),
+    Input('chat-data', 'data')
+)
 
 # Expose the Flask server for production deployment (gunicorn)
 server = app.server
@@ -1862,8 +1730,9 @@ if __name__ == '__main__':
     
     if use_production:
         print("🏭 Using Gunicorn production server")
-        # When using gunicorn, it will handle the server startup
-        # Start with: gunicorn stunning_dashboard:server -b 0.0.0.0:$PORT
+        # When using gunicorn, it will handle the server startup. Every open tab holds one
+        # thread for its /api/updates stream, so sync workers would be used up by a few tabs:
+        # gunicorn stunning_dashboard:server -b 0.0.0.0:$PORT --worker-class gthread --threads 32
     else:
         print("🔧 Using Flask development server")
-        app.run(host='0.0.0.0', port=port, debug=False)
+        app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
@@ -1,7 +1,11 @@
 
 #!/usr/bin/env python3
 import json
+import threading
+import time
+from contextlib import contextmanager
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 from telegram import Update
 from telegram.ext import Application, CommandHandler, ContextTypes
 import asyncio
@@ -19,8 +23,112 @@ except ImportError:
     with open(get_config_path(), 'r') as f:
         config = json.load(f)
 
+# Read once; the /status and /pnl queries pass it as their $1
+INITIAL_CAPITAL = config['initial_capital']
+
+# Command queries, prepared once per pooled connection and then run with EXECUTE
+BOT_QUERIES = {
+    # /status and /pnl both read the latest risk snapshot; $1 is the initial capital
+    'risk_latest_q': """
+        SELECT
+            total_capital,
+            available_capital,
+            total_exposure,
+            daily_pnl,
+            total_pnl,
+            COALESCE(daily_pnl / NULLIF(total_capital, 0) * 100, 0) as daily_pct,
+            COALESCE(total_pnl / NULLIF($1::numeric, 0) * 100, 0) as total_pct
+        FROM risk_metrics
+        ORDER BY timestamp DESC
+        LIMIT 1
+    """,
+    'open_positions_q': """
+        SELECT
+            symbol,
+            entry_price,
+            current_price,
+            amount,
+            COALESCE((current_price - entry_price) / NULLIF(entry_price, 0) * 100, 0) as pnl_pct
+        FROM positions
+        WHERE status = 'open'
+    """,
+    'recent_trades_q': """
+        SELECT timestamp, symbol, side, price, amount
+        FROM trades
+        ORDER BY timestamp DESC
+        LIMIT 10
+    """
+}
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """Connection that remembers which BOT_QUERIES it has already prepared"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+# Commands share a few kept-alive connections instead of connecting per message; the
+# pool size also caps how many commands are handled at once (see main)
+DB_POOL_MIN = 1
+DB_POOL_MAX = 4
+db_pool = None
+db_pool_lock = threading.Lock()
+
+def get_db_pool():
+    global db_pool
+    with db_pool_lock:
+        if db_pool is None:
+            db_pool = ThreadedConnectionPool(
+                DB_POOL_MIN, DB_POOL_MAX,
+                **config['database'],
+                connection_factory=PreparingConnection
+            )
+        return db_pool
+
+@contextmanager
 def get_db_connection():
-    return psycopg2.connect(**config['database'])
+    """Borrow a pooled connection and hand it back afterwards"""
+    pool = get_db_pool()
+    conn = pool.getconn()
+    if conn.closed:
+        pool.putconn(conn, close=True)
+        conn = pool.getconn()
+    try:
+        conn.autocommit = True  # read-only queries; a failure must not abort later ones
+        yield conn
+    finally:
+        pool.putconn(conn, close=bool(conn.closed))
+
+def fetch_prepared(name, params=()):
+    """Rows of a BOT_QUERIES statement, preparing it on first use by the borrowed connection.
+    Blocking; handlers call it through asyncio.to_thread to keep the event loop free."""
+    with get_db_connection() as conn:
+        with conn.cursor() as cursor:
+            if name not in conn.prepared:
+                cursor.execute(f"PREPARE {name} AS {BOT_QUERIES[name]}")
+                conn.prepared.add(name)
+            if params:
+                cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+            else:
+                cursor.execute(f"EXECUTE {name}")
+            return cursor.fetchall()
+
+# /status and /pnl read the same snapshot row, so back-to-back commands share one query
+RISK_CACHE_TTL = 1.0
+risk_cache = (0.0, None)
+risk_cache_lock = threading.Lock()
+
+def latest_risk_metrics():
+    """Latest risk_latest_q row (or None), reused for RISK_CACHE_TTL seconds"""
+    global risk_cache
+    with risk_cache_lock:
+        fetched_at, row = risk_cache
+        if fetched_at and time.monotonic() - fetched_at < RISK_CACHE_TTL:
+            return row
+    rows = fetch_prepared('risk_latest_q', (INITIAL_CAPITAL,))
+    row = rows[0] if rows else None
+    with risk_cache_lock:
+        risk_cache = (time.monotonic(), row)
+    return row
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Send a message when the command /start is issued."""
@@ -35,16 +143,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Get portfolio status"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT total_capital, available_capital, total_exposure, daily_pnl, total_pnl
-        FROM risk_metrics
-        ORDER BY timestamp DESC
-        LIMIT 1
-    """)
-    result = cursor.fetchone()
+    result = await asyncio.to_thread(latest_risk_metrics)
     
     if result:
         msg = f"📊 *Portfolio Status*\n\n"
@@ -56,51 +155,27 @@ async def status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         msg = "No data available yet."
     
-    cursor.close()
-    conn.close()
-    
     await update.message.reply_text(msg, parse_mode='Markdown')
 
 async def positions(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Get open positions"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT symbol, entry_price, current_price, amount
-        FROM positions
-        WHERE status = 'open'
-    """)
-    positions = cursor.fetchall()
+    positions = await asyncio.to_thread(fetch_prepared, 'open_positions_q')
     
     if positions:
         msg = "📍 *Open Positions*\n\n"
-        for p in positions:
-            pnl_pct = ((p[2] - p[1]) / p[1]) * 100
+        for symbol, entry_price, current_price, amount, pnl_pct in positions:
             emoji = "🟢" if pnl_pct > 0 else "🔴"
-            msg += f"{emoji} {p[0]}\n"
-            msg += f"   Entry: ${p[1]:,.2f} | Current: ${p[2]:,.2f}\n"
-            msg += f"   Amount: {p[3]:.6f} | PnL: {pnl_pct:+.2f}%\n\n"
+            msg += f"{emoji} {symbol}\n"
+            msg += f"   Entry: ${entry_price:,.2f} | Current: ${current_price:,.2f}\n"
+            msg += f"   Amount: {amount:.6f} | PnL: {pnl_pct:+.2f}%\n\n"
     else:
         msg = "No open positions."
     
-    cursor.close()
-    conn.close()
-    
     await update.message.reply_text(msg, parse_mode='Markdown')
 
 async def trades(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Get recent trades"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT timestamp, symbol, side, price, amount
-        FROM trades
-        ORDER BY timestamp DESC
-        LIMIT 10
-    """)
-    trades = cursor.fetchall()
+    trades = await asyncio.to_thread(fetch_prepared, 'recent_trades_q')
     
     if trades:
         msg = "📝 *Recent Trades*\n\n"
@@ -112,28 +187,14 @@ async def trades(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         msg = "No trades yet."
     
-    cursor.close()
-    conn.close()
-    
     await update.message.reply_text(msg, parse_mode='Markdown')
 
 async def pnl(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Get PnL summary"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT daily_pnl, total_pnl, total_capital
-        FROM risk_metrics
-        ORDER BY timestamp DESC
-        LIMIT 1
-    """)
-    result = cursor.fetchone()
+    result = await asyncio.to_thread(latest_risk_metrics)
     
     if result:
-        daily_pnl, total_pnl, total_capital = result
-        daily_pct = (daily_pnl / total_capital) * 100
-        total_pct = (total_pnl / config['initial_capital']) * 100
+        total_capital, _, _, daily_pnl, total_pnl, daily_pct, total_pct = result
         
         msg = f"💰 *Profit/Loss Summary*\n\n"
         msg += f"📅 Daily PnL: ${daily_pnl:,.2f} ({daily_pct:+.2f}%)\n"
@@ -142,15 +203,19 @@ async def pnl(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         msg = "No data available yet."
     
-    cursor.close()
-    conn.close()
-    
     await update.message.reply_text(msg, parse_mode='Markdown')
 
 def main():
     """Start the bot"""
     # Create application
-    application = Application.builder().token(config['telegram']['bot_token']).build()
+    # Handlers run their queries on worker threads, so several commands can be in flight
+    # at once; at most one per pooled connection
+    application = (
+        Application.builder()
+        .token(config['telegram']['bot_token'])
+        .concurrent_updates(DB_POOL_MAX)
+        .build()
+    )
     
     # Add handlers
     application.add_handler(CommandHandler("start", start))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for the portfolio chart's M4 downsampling (professional_dashboard.m4_downsample)
+Tests different scenarios:
+1. Short series → returned unchanged
+2. One week of minute points → at most 4 points per column, every column's spike kept
+3. 800 days of minute points → every column's spike kept (no int64 overflow)
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+
+from professional_dashboard import m4_downsample
+
+WIDTH = 400
+
+def minute_series(days):
+    """Minute timestamps over `days` days: a sine wave with a distinct spike in the middle of
+    every pixel column. Nanosecond resolution, as the history arrives from the database"""
+    points = days * 24 * 60
+    timestamps = pd.date_range('2024-01-01', periods=points, freq='min', unit='ns')
+    values = 100 + 10 * np.sin(np.arange(points) / 500)
+    spikes = 1000.0 + np.arange(WIDTH)
+    values[np.arange(WIDTH) * points // WIDTH + points // (2 * WIDTH)] = spikes
+    return timestamps, values.tolist(), spikes.tolist()
+
+def check_downsampled(days):
+    timestamps, values, spikes = minute_series(days)
+    kept_t, kept_v = m4_downsample(timestamps, values, WIDTH)
+    
+    assert len(kept_t) == len(kept_v), "Timestamps and values differ in length"
+    assert len(kept_v) <= 4 * WIDTH, f"Expected at most {4 * WIDTH} points, got {len(kept_v)}"
+    assert len(kept_v) >= 2 * WIDTH, f"Expected at least {2 * WIDTH} points, got {len(kept_v)}"
+    assert list(kept_t) == sorted(kept_t), "Points are out of order"
+    assert kept_t[0] == timestamps[0] and kept_t[-1] == timestamps[-1], "First or last point dropped"
+    # Each column's maximum is its spike; garbled columns would merge spikes and drop some
+    missing = set(spikes) - set(kept_v)
+    assert not missing, f"{len(missing)} of {WIDTH} column spikes dropped"
+    return len(kept_v)
+
+def test_m4_downsample():
+    print("Testing m4_downsample...")
+    print("-" * 50)
+    
+    # Test 1: Short series is left alone
+    timestamps, values, _ = minute_series(1)
+    timestamps, values = timestamps[:100], values[:100]
+    kept_t, kept_v = m4_downsample(timestamps, values, WIDTH)
+    assert list(kept_t) == list(timestamps) and kept_v == values, "Test 1 failed: short series was changed"
+    print("✅ Test 1: 100 points → unchanged")
+    
+    # Test 2: One week
+    kept = check_downsampled(7)
+    print(f"✅ Test 2: 7 days of minutes → {kept} points")
+    
+    # Test 3: Over two years; (t - t[0]) * width in nanoseconds overflows int64 past ~266 days,
+    # and by this span the wrapped column numbers merge separate columns
+    kept = check_downsampled(800)
+    print(f"✅ Test 3: 800 days of minutes → {kept} points")
+    
+    print("-" * 50)
+    print("✅ ALL M4 DOWNSAMPLING TESTS PASSED!")
+    return True
+
+if __name__ == "__main__":
+    try:
+        test_m4_downsample()
+        sys.exit(0)
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)